@@ -0,0 +1,33 @@
+"""Countdown built incrementally with ProgramBuilder.
+
+Reads N from user input and counts down to 1. Labels are resolved as instructions are
+added, including the forward jump past the loop when N isn't positive.
+"""
+
+import dt31.instructions as I
+from dt31.builder import ProgramBuilder
+from dt31.cpu import DT31
+from dt31.operands import L, Label, R
+
+builder = ProgramBuilder()
+builder.add(
+    # Read the starting value
+    I.NIN(R.a),
+    # Skip the loop if N <= 0 ("end" isn't declared yet, so this is patched later)
+    I.JLE(Label("end"), R.a, L[0]),
+)
+loop = builder.label("loop")
+builder.add(
+    # Print the counter with a newline
+    I.NOUT(R.a, L[1]),
+    # Decrement and loop while the counter is positive
+    I.SUB(R.a, L[1]),
+    I.JGT(loop, R.a, L[0]),
+)
+builder.label("end")
+countdown = builder.build()
+
+if __name__ == "__main__":
+    cpu = DT31(registers=["a"])
+    print("Enter a number to count down from:")
+    cpu.run(countdown, debug=False)
@@ -1,29 +1,49 @@
-from copy import deepcopy
+from typing import TYPE_CHECKING
 
 from dt31.exceptions import AssemblyError
-from dt31.instructions import Instruction, RelativeJumpMixin
-from dt31.operands import Label, Literal, MemoryReference, Operand, RegisterReference
+from dt31.instructions import (
+    JUMP_CLASSES,
+    Handler,
+    Instruction,
+    Jump,
+    compile_block,
+    fuse_compare_branch,
+    is_sequential,
+)
+from dt31.operands import (
+    Label,
+    Literal,
+    MemoryReference,
+    RegisterReference,
+    intern_literal,
+)
 from dt31.parser import BlankLine, Comment
 
+if TYPE_CHECKING:
+    from dt31.cpu import DT31  # pragma: no cover
+
+_NON_INSTRUCTIONS = (Comment, BlankLine)
+
 
 def assemble(
     program: list[Instruction | Label | Comment | BlankLine] | list[Instruction],
 ) -> list[Instruction]:
     """Assemble a program by resolving labels to instruction positions.
 
-    This function performs a two-pass assembly process:
+    This function performs a single-pass assembly process:
 
-    **Pass 1 - Symbol Table Construction:**
-    - Scans through the program to find all Label definitions
-    - Records each label's name and its corresponding instruction pointer (IP)
+    **Symbol Table Construction:**
+    - Records each Label's name and its corresponding instruction pointer (IP)
     - Removes labels from the instruction list (they're assembly-time only)
     - Validates that labels are not defined multiple times
 
-    **Pass 2 - Label Resolution:**
+    **Label Resolution:**
     - For each jump/call instruction that references a label:
       - Replaces the label with the actual instruction position
       - For absolute jumps/calls (JMP, CALL, etc.): uses direct IP
       - For relative jumps/calls (RJMP, RCALL, etc.): calculates offset from current position
+    - Backward references are resolved immediately; forward references are kept on a
+      patch list and resolved when their label is reached
     - Validates that all referenced labels are defined
 
     Args:
@@ -67,41 +87,57 @@ def assemble(
         ]
         ```
     """
-    new_program = []
-    used_labels = set()
-    label_to_ip = {}
+    new_program: list[Instruction] = []
+    append = new_program.append
+    label_to_ip: dict[str, int] = {}
+    # Forward references: label name -> [(ip, instruction)] awaiting the label
+    pending: dict[str, list[tuple[int, Jump]]] = {}
 
-    # First pass populates label_to_ip
-    ip = 0
     for inst in program:
         if isinstance(inst, Label):
-            if inst.name in used_labels:
-                raise AssemblyError(f"Label {inst.name} used more than once.")
-            used_labels.add(inst.name)
-            label_to_ip[inst.name] = ip
-        elif isinstance(inst, (Comment, BlankLine)):
+            name = inst.name
+            if name in label_to_ip:
+                raise AssemblyError(f"Label {name} used more than once.")
+            ip = len(new_program)
+            label_to_ip[name] = ip
+            if pending:
+                for inst_ip, waiting in pending.pop(name, ()):
+                    patch_dest(waiting, inst_ip, ip)
+        elif isinstance(inst, _NON_INSTRUCTIONS):
             continue
         else:
-            new_program.append(deepcopy(inst))
-            ip += 1
-
-    # Second pass to replace label references
-    for ip, inst in enumerate(new_program):
-        if hasattr(inst, "dest") and isinstance(inst.dest, Label):
-            try:
-                target_ip = label_to_ip[inst.dest.name]
-            except KeyError:
-                raise AssemblyError(f"Undefined label: {inst.dest.name}")
-
-            if isinstance(inst, RelativeJumpMixin):
-                delta = target_ip - ip
-                inst.dest = Literal(delta)
-            else:
-                inst.dest = Literal(target_ip)
+            inst = inst.clone()
+            if type(inst) in JUMP_CLASSES and isinstance(inst.dest, Label):
+                name = inst.dest.name
+                target_ip = label_to_ip.get(name)
+                if target_ip is not None:
+                    patch_dest(inst, len(new_program), target_ip)
+                else:
+                    pending.setdefault(name, []).append((len(new_program), inst))
+            append(inst)
+
+    if pending:
+        raise AssemblyError(f"Undefined label: {next(iter(pending))}")
 
     return new_program
 
 
+def patch_dest(inst: Jump, inst_ip: int, target_ip: int) -> None:
+    """Replace an instruction's label destination with a resolved position.
+
+    Used by `assemble` and `dt31.builder.ProgramBuilder` to resolve jumps and calls.
+
+    Args:
+        inst: The jump/call instruction to patch.
+        inst_ip: The position of `inst` in the assembled program.
+        target_ip: The position the label resolves to.
+    """
+    if inst.is_relative:
+        inst.dest = intern_literal(target_ip - inst_ip)
+    else:
+        inst.dest = intern_literal(target_ip)
+
+
 def extract_registers_from_program(
     program: list[Instruction | Label | Comment | BlankLine],
 ) -> list[str]:
@@ -130,23 +166,115 @@ def extract_registers_from_program(
     """
     registers_used: set[str] = set()
 
-    def extract_from_operand(operand: Operand) -> None:
-        """Recursively extract registers from an operand."""
-        if isinstance(operand, RegisterReference):
-            if operand.register != "ip":
-                registers_used.add(operand.register)
-        elif isinstance(operand, MemoryReference):
-            # Memory references can contain nested operands (e.g., M[R.a])
-            extract_from_operand(operand.address)
-
     for item in program:
         if isinstance(item, (Label, Comment, BlankLine)):
             continue
 
-        # Instructions store operands as attributes
-        # Walk through all attributes to find operands
-        for attr_value in item.__dict__.values():
-            if isinstance(attr_value, (RegisterReference, MemoryReference)):
-                extract_from_operand(attr_value)
+        operand_attrs = type(item).OPERAND_ATTRS
+        if operand_attrs is None:
+            operands = list(vars(item).values())
+        else:
+            operands = [getattr(item, name, None) for name in operand_attrs]
+
+        # Memory references can contain nested operands (e.g., M[R.a])
+        while operands:
+            operand = operands.pop()
+            if isinstance(operand, RegisterReference):
+                if operand.register != "ip":
+                    registers_used.add(operand.register)
+            elif isinstance(operand, MemoryReference):
+                operands.append(operand.address)
 
     return sorted(registers_used)
+
+
+def thread(program: list[Instruction]) -> list[Handler]:
+    """Compile an assembled program into threaded code.
+
+    Each instruction is lowered to a handler with `Instruction.compile_threaded`, so
+    that executing the program is a loop of `ip = handlers[ip](cpu, ip)` with no
+    per-step method resolution on the instruction objects.
+
+    Sequential handlers (those that never jump) are fused with the handler after them
+    into a superinstruction, halving the number of dispatches through straight-line
+    code. Every position keeps a handler of its own, so jumping into the middle of a
+    fused pair still works. A comparison followed by a branch on its result is fused
+    into a single compare-and-branch handler instead (see
+    `dt31.instructions.fuse_compare_branch`), which the instruction before the
+    comparison is in turn fused with.
+
+    Finally, where a basic block may be entered (the start of the program, literal jump
+    targets and positions after a jump), straight-line runs of instructions are compiled
+    into a single block handler with `dt31.instructions.compile_block`.
+
+    Args:
+        program: An assembled program, as returned by `assemble`.
+
+    Returns:
+        A list of handlers, one per instruction in `program`.
+    """
+    handlers = [inst.compile_threaded() for inst in program]
+    threaded = handlers.copy()
+    branches: dict[int, Handler] = {}
+    for ip in range(len(handlers) - 1):
+        if is_sequential(handlers[ip]):
+            branch = fuse_compare_branch(program[ip], program[ip + 1])
+            if branch is not None:
+                branches[ip] = branch
+    for ip in range(len(handlers) - 1):
+        if ip in branches:
+            threaded[ip] = branches[ip]
+        elif is_sequential(handlers[ip]):
+            # Fusing with a compare-and-branch covers the usual loop tail in one call
+            threaded[ip] = _fuse(handlers[ip], branches.get(ip + 1, handlers[ip + 1]))
+
+    # Blocks continue with the fused handlers, never another block, so calls don't nest
+    blocks = [
+        (ip, compile_block(program, ip, threaded))
+        for ip in _block_entries(program, handlers)
+    ]
+    for ip, block in blocks:
+        if block is not None:
+            threaded[ip] = block
+    return threaded
+
+
+def _block_entries(program: list[Instruction], handlers: list[Handler]) -> list[int]:
+    """Find positions where execution may enter a straight-line run of instructions.
+
+    Args:
+        program: An assembled program.
+        handlers: The handlers compiled for each instruction of `program`.
+
+    Returns:
+        The start of the program, the targets of jumps with literal destinations and
+        the positions after instructions that may jump, in ascending order.
+    """
+    entries = {0}
+    for ip, inst in enumerate(program):
+        if not is_sequential(handlers[ip]):
+            entries.add(ip + 1)
+        if type(inst) in JUMP_CLASSES and isinstance(inst.dest, Literal):
+            entries.add(inst.dest.value + ip if inst.is_relative else inst.dest.value)
+    return sorted(ip for ip in entries if 0 <= ip < len(program))
+
+
+def _fuse(first: Handler, second: Handler) -> Handler:
+    """Fuse two handlers into a superinstruction executing both.
+
+    Args:
+        first: A sequential handler.
+        second: The handler of the following instruction.
+
+    Returns:
+        A handler running `first`, then `second`, counting both as steps.
+    """
+
+    def fused(cpu: "DT31", ip: int) -> int:
+        first(cpu, ip)
+        cpu.step_count += 1
+        ip += 1
+        cpu.registers["ip"] = ip
+        return second(cpu, ip)
+
+    return fused
@@ -0,0 +1,89 @@
+"""Incremental program construction with labels resolved as instructions are added.
+
+`ProgramBuilder` is an alternative to passing labels through `dt31.assembler.assemble`:
+backward references are resolved when a jump is added and forward references are
+patched as soon as their label is declared, so the finished program needs no label
+resolution pass.
+"""
+
+from dt31.assembler import patch_dest
+from dt31.exceptions import AssemblyError
+from dt31.instructions import JUMP_CLASSES, Instruction, Jump
+from dt31.operands import Label
+
+
+class ProgramBuilder:
+    """Build a program one instruction at a time, resolving labels on the fly.
+
+    Example:
+        >>> from dt31 import DT31, I, L, Label, R
+        >>> builder = ProgramBuilder()
+        >>> builder.add(I.CP(3, R.a))
+        >>> loop = builder.label("loop")
+        >>> builder.add(I.NOUT(R.a, L[1]), I.SUB(R.a, L[1]), I.JGT(loop, R.a, L[0]))
+        >>> builder.build()[3]
+        JGT(dest=1, a=R.a, b=0)
+        >>> DT31().run(builder.build())
+        3
+        2
+        1
+    """
+
+    def __init__(self):
+        self._program: list[Instruction] = []
+        self._label_to_ip: dict[str, int] = {}
+        self._pending: dict[str, list[tuple[int, Jump]]] = {}
+
+    def add(self, *instructions: Instruction):
+        """Append instructions to the program.
+
+        Instructions are copied, so the originals are never modified. A jump to a label
+        that was already declared is resolved immediately; a jump to a label that
+        hasn't been declared yet is patched when `label` declares it.
+
+        Args:
+            *instructions: The instructions to append, in order.
+        """
+        for inst in instructions:
+            inst = inst.clone()
+            ip = len(self._program)
+            if type(inst) in JUMP_CLASSES and isinstance(inst.dest, Label):
+                name = inst.dest.name
+                if name in self._label_to_ip:
+                    patch_dest(inst, ip, self._label_to_ip[name])
+                else:
+                    self._pending.setdefault(name, []).append((ip, inst))
+            self._program.append(inst)
+
+    def label(self, name: str) -> Label:
+        """Declare a label at the position of the next added instruction.
+
+        Args:
+            name: The label's name.
+
+        Returns:
+            A `Label` which can be used as the destination of jumps added later.
+
+        Raises:
+            AssemblyError: If the label was already declared.
+        """
+        if name in self._label_to_ip:
+            raise AssemblyError(f"Label {name} used more than once.")
+        ip = len(self._program)
+        self._label_to_ip[name] = ip
+        for inst_ip, inst in self._pending.pop(name, ()):
+            patch_dest(inst, inst_ip, ip)
+        return Label(name)
+
+    def build(self) -> list[Instruction]:
+        """Get the program built so far.
+
+        Returns:
+            A new list of instructions with all label references resolved.
+
+        Raises:
+            AssemblyError: If a jump references a label that was never declared.
+        """
+        if self._pending:
+            raise AssemblyError(f"Undefined label: {next(iter(self._pending))}")
+        return list(self._program)
@@ -169,6 +169,13 @@ registers in most cases.
 If you explicitly provide `--registers`, the CLI validates that all registers used
 in the program are included in your list.
 
+## Parse Cache
+
+Set `DT31_PARSE_CACHE=1` to have the `run` and `check` commands cache parsed programs
+in `$XDG_CACHE_HOME/dt31` (`~/.cache/dt31` by default), so running an unchanged file
+again skips parsing. The cache keeps the most recently used 256 programs. Programs
+using custom instructions are never cached.
+
 ## Exit Codes
 
 - **0**: Success
@@ -220,11 +227,13 @@ Example error dump structure:
 """
 
 import argparse
-import difflib
+import functools
 import glob
-import importlib.metadata
+import hashlib
 import importlib.util
 import json
+import os
+import pickle
 import sys
 import traceback
 from datetime import datetime
@@ -236,6 +245,35 @@ from dt31.formatter import program_to_text
 from dt31.instructions import Instruction
 from dt31.parser import ParserError, parse_program
 
+# Options of the 'run' subcommand understood by `_fast_parse_run`
+_RUN_FLAGS = {
+    "-d": "debug",
+    "--debug": "debug",
+    "-v": "verbose",
+    "--verbose": "verbose",
+}
+_RUN_OPTIONS = {
+    "-r": "registers",
+    "--registers": "registers",
+    "-m": "memory",
+    "--memory": "memory",
+    "-s": "stack_size",
+    "--stack-size": "stack_size",
+    "-i": "custom_instructions",
+    "--custom-instructions": "custom_instructions",
+    "--dump": "dump",
+    "--dump-file": "dump_file",
+}
+_DUMP_CHOICES = ["none", "error", "success", "all"]
+_PARSE_CACHE_MAX_ENTRIES = 256
+"""Number of parsed programs kept by the on-disk parse cache."""
+
+_CUSTOM_INSTRUCTIONS_CACHE: dict[str, tuple[tuple[int, int], dict]] = {}
+"""Custom instructions loaded by `load_custom_instructions`, keyed by resolved path.
+
+Each entry holds the file's `(mtime_ns, size)` when loaded, so edited files are
+loaded again."""
+
 
 def format_time(nanoseconds: int) -> str:
     """Format time in nanoseconds with appropriate units (µs, ms, or s).
@@ -361,7 +399,7 @@ examples:
         "--dump",
         type=str,
         default="none",
-        choices=["none", "error", "success", "all"],
+        choices=_DUMP_CHOICES,
         help="When to dump CPU state: 'none' (default), 'error', 'success', or 'all'",
     )
 
@@ -417,6 +455,127 @@ examples:
     )
 
 
+def _cache_dir() -> str:
+    """Get the directory for cached parse results (`$XDG_CACHE_HOME/dt31`)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "dt31")
+
+
+def _source_key(assembly_text: str) -> str:
+    """Hash a program's source with the dt31 and Python versions and syntax modules."""
+    # Deferred: importlib.metadata is slow to import and only needed with the cache on
+    import importlib.metadata
+
+    try:
+        version = importlib.metadata.version("dt31")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    digest = hashlib.blake2b(assembly_text.encode(), digest_size=16)
+    digest.update(f"{version} {sys.version_info}".encode())
+    package_dir = os.path.dirname(__file__)
+    for module in ("parser.py", "instructions.py", "operands.py"):
+        mtime = os.stat(os.path.join(package_dir, module)).st_mtime_ns
+        digest.update(str(mtime).encode())
+    return digest.hexdigest()
+
+
+def _parse_with_registers(
+    assembly_text: str, custom_instructions: dict[str, type[Instruction]] | None
+) -> tuple[list, list[str]]:
+    """Parse a program and extract its registers.
+
+    Without custom instructions, registers are collected while parsing rather than in
+    a second pass over the program.
+    """
+    if custom_instructions:
+        # Custom instructions may add register operands that aren't in the source
+        program = parse_program(assembly_text, custom_instructions=custom_instructions)
+        return program, extract_registers_from_program(program)
+
+    registers: set[str] = set()
+    program = parse_program(assembly_text, registers=registers)
+    return program, sorted(registers)
+
+
+def _parse_cache_enabled(
+    custom_instructions: dict[str, type[Instruction]] | None,
+) -> bool:
+    """Whether parse results may be cached (opted in, no custom instructions)."""
+    return not custom_instructions and bool(os.environ.get("DT31_PARSE_CACHE"))
+
+
+def _evict_parse_cache(cache_dir: str) -> None:
+    """Remove the least recently used entries beyond `_PARSE_CACHE_MAX_ENTRIES`."""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".pkl"):
+            try:
+                entries.append((entry.stat().st_mtime_ns, entry.path))
+            except OSError:
+                pass
+    entries.sort(reverse=True)
+    for _, path in entries[_PARSE_CACHE_MAX_ENTRIES:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _parse_cached(
+    assembly_text: str, custom_instructions: dict[str, type[Instruction]] | None
+) -> tuple[list, list[str]]:
+    """Parse a program and extract its registers, reusing results from earlier runs.
+
+    When the `DT31_PARSE_CACHE` environment variable is set, results are pickled to
+    the cache directory, keyed by a hash of the source, so running an unchanged file
+    again skips parsing. Only the most recently used `_PARSE_CACHE_MAX_ENTRIES`
+    results are kept. The cache is bypassed when custom instructions are used, and
+    any failure to read or write it falls back to parsing.
+
+    Args:
+        assembly_text: The program source.
+        custom_instructions: Custom instruction definitions, if any.
+
+    Returns:
+        The parsed program and the sorted names of the registers it uses.
+
+    Raises:
+        ParserError: If the program can't be parsed.
+    """
+    if not _parse_cache_enabled(custom_instructions):
+        return _parse_with_registers(assembly_text, custom_instructions)
+
+    cache_dir = _cache_dir()
+    cache_path = os.path.join(cache_dir, f"{_source_key(assembly_text)}.pkl")
+    try:
+        with open(cache_path, "rb") as f:
+            result = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        # Missing, unreadable or stale cache entry: parse from scratch
+        pass
+    else:
+        try:
+            # Mark the entry as recently used
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return result
+
+    result = _parse_with_registers(assembly_text, None)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+        _evict_parse_cache(cache_dir)
+    except (OSError, pickle.PicklingError):
+        pass
+    return result
+
+
 def run_command(args: argparse.Namespace) -> None:
     """Execute the 'run' subcommand - parse and execute a dt31 program.
 
@@ -462,16 +621,13 @@ def run_command(args: argparse.Namespace) -> None:
         print(f"Error reading file {args.file}: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Parse the assembly program with custom instructions
+    # Parse the assembly program with custom instructions and extract its registers
     try:
-        program = parse_program(assembly_text, custom_instructions=custom_instructions)
+        program, registers_used = _parse_cached(assembly_text, custom_instructions)
     except ParserError as e:
         print(f"Parse error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Extract registers used in the program
-    registers_used = extract_registers_from_program(program)
-
     # Create CPU with custom configuration
     cpu_kwargs = {}
     if args.memory is not None:
@@ -481,14 +637,17 @@ def run_command(args: argparse.Namespace) -> None:
 
     if args.registers:
         # User provided explicit registers - validate they include all used registers
-        user_registers = args.registers.split(",")
-        missing = set(registers_used) - set(user_registers)
+        # Tolerate spaces around names and stray commas (e.g. "a, b,")
+        user_registers = [r for r in map(str.strip, args.registers.split(",")) if r]
+        user_set = frozenset(user_registers)
+        # registers_used is sorted, so missing is too
+        missing = [r for r in registers_used if r not in user_set]
         if missing:
             print(
                 f"Error: Program uses registers {registers_used} but --registers only specified {user_registers}",
                 file=sys.stderr,
             )
-            print(f"Missing registers: {sorted(missing)}", file=sys.stderr)
+            print(f"Missing registers: {missing}", file=sys.stderr)
             sys.exit(1)
         cpu_kwargs["registers"] = user_registers
     elif registers_used:
@@ -516,12 +675,15 @@ def run_command(args: argparse.Namespace) -> None:
     except Exception as e:
         print(f"\nRuntime error: {e}", file=sys.stderr)
         if args.debug:
-            state = cpu.state
-            print("\nCPU state at error:", file=sys.stderr)
-            # Print registers (keys starting with R.)
-            registers = {k: v for k, v in state.items() if k.startswith("R.")}
-            print(f"  Registers: {registers}", file=sys.stderr)
-            print(f"  Stack size: {len(state['stack'])}", file=sys.stderr)
+            # Read registers and stack directly: cpu.state would also copy all of
+            # memory and the stack
+            registers = {f"R.{k}": v for k, v in cpu.registers.items()}
+            print(
+                "\nCPU state at error:\n"
+                f"  Registers: {registers}\n"
+                f"  Stack size: {len(cpu.stack)}",
+                file=sys.stderr,
+            )
 
         # Dump CPU state to file if requested
         if args.dump in ("error", "all"):
@@ -623,7 +785,11 @@ def check_command(args: argparse.Namespace) -> None:
 
         # Parse the assembly program with custom instructions
         try:
-            parse_program(assembly_text, custom_instructions=custom_instructions)
+            if _parse_cache_enabled(custom_instructions):
+                _parse_cached(assembly_text, custom_instructions)
+            else:
+                # Nothing to cache, so skip extracting registers
+                parse_program(assembly_text, custom_instructions=custom_instructions)
         except ParserError as e:
             print(f"Parse error in {display_path}: {e}", file=sys.stderr)
             failed_files.append(file_path_str)
@@ -830,6 +996,9 @@ def _format_single_file(
     # Handle --diff flag
     if show_diff:
         if needs_formatting:
+            # Deferred: difflib is only needed when there's a diff to show
+            import difflib
+
             # Show unified diff
             diff = difflib.unified_diff(
                 original_text.splitlines(keepends=True),
@@ -941,19 +1110,15 @@ def format_command(args: argparse.Namespace) -> None:
         sys.exit(0)
 
 
-def main() -> None:
-    """Main entry point for the dt31 CLI.
+@functools.cache
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the full argument parser with all subcommands.
 
-    Supports two subcommands:
-    - run: Execute a dt31 assembly program
-    - format: Format a dt31 assembly file with consistent style
+    The parser is built once per process and reused by later calls.
 
-    Exit codes:
-        0: Success
-        1: Error occurred
-        130: User interrupted execution (Ctrl+C)
+    Returns:
+        The `dt31` argument parser.
     """
-    # Create main parser with subcommands
     parser = argparse.ArgumentParser(
         prog="dt31",
         description="dt31 assembly language tools",
@@ -978,9 +1143,90 @@ def main() -> None:
     # Create 'format' subcommand
     _create_format_parser(subparsers)
 
-    args = parser.parse_args()
+    return parser
+
+
+def _fast_parse_run(argv: list[str]) -> argparse.Namespace | None:
+    """Parse a plain `run` invocation without building the argparse parsers.
+
+    Only handles `run` followed by known options (as `--opt value` or `--opt=value`)
+    and a single file. Anything else, including help requests and invalid values,
+    returns None so the full parser can handle it and report errors.
+
+    Args:
+        argv: Command-line arguments, excluding the program name.
+
+    Returns:
+        The same namespace argparse would produce, or None if the arguments need the
+        full parser.
+    """
+    if not argv or argv[0] != "run":
+        return None
+
+    values: dict[str, str | int | bool | None] = {
+        "debug": False,
+        "registers": None,
+        "memory": None,
+        "stack_size": None,
+        "custom_instructions": None,
+        "dump": "none",
+        "dump_file": None,
+        "verbose": False,
+    }
+    file = None
+    tokens = iter(argv[1:])
+    for token in tokens:
+        if token in _RUN_FLAGS:
+            values[_RUN_FLAGS[token]] = True
+        elif token.startswith("-"):
+            name, eq, value = token.partition("=")
+            if name not in _RUN_OPTIONS:
+                return None
+            if not eq:
+                value = next(tokens, None)
+                if value is None or value.startswith("-"):
+                    return None
+            values[_RUN_OPTIONS[name]] = value
+        elif file is None:
+            file = token
+        else:
+            return None
+
+    if file is None or values["dump"] not in _DUMP_CHOICES:
+        return None
+    for name in ("memory", "stack_size"):
+        if values[name] is not None:
+            try:
+                values[name] = int(values[name])
+            except ValueError:
+                return None
+
+    return argparse.Namespace(version=False, command="run", file=file, **values)
+
+
+def main() -> None:
+    """Main entry point for the dt31 CLI.
+
+    Supports two subcommands:
+    - run: Execute a dt31 assembly program
+    - format: Format a dt31 assembly file with consistent style
+
+    Plain `run` invocations are parsed by a fast path; everything else goes through
+    the full argparse parser.
+
+    Exit codes:
+        0: Success
+        1: Error occurred
+        130: User interrupted execution (Ctrl+C)
+    """
+    args = _fast_parse_run(sys.argv[1:])
+    if args is None:
+        args = _build_parser().parse_args()
 
     if args.version:
+        # Deferred: importlib.metadata is slow to import and only needed here
+        import importlib.metadata
+
         print(f"dt31 v{importlib.metadata.version('dt31')}")
         sys.exit(0)
 
@@ -993,7 +1239,7 @@ def main() -> None:
         format_command(args)
     else:
         # Should never reach here due to required subcommand, but handle gracefully
-        parser.print_help()
+        _build_parser().print_help()
         sys.exit(1)
 
 
@@ -1074,7 +1320,8 @@ def load_custom_instructions(file_path: str) -> dict[str, type[Instruction]]:
     """Load custom instruction definitions from a Python file.
 
     The file should define an INSTRUCTIONS dict mapping instruction names
-    to Instruction subclasses.
+    to Instruction subclasses. Loading the same file again returns the same dict
+    without re-executing it, unless the file has been modified.
 
     Args:
         file_path: Path to Python file containing custom instructions
@@ -1118,6 +1365,13 @@ def load_custom_instructions(file_path: str) -> dict[str, type[Instruction]]:
     if not path.exists():
         raise FileNotFoundError(f"Custom instructions file not found: {file_path}")
 
+    # Reuse the instructions loaded from this file unless it has changed since
+    stat = path.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _CUSTOM_INSTRUCTIONS_CACHE.get(str(path))
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
     # Load module from file
     spec = importlib.util.spec_from_file_location("custom_instructions", path)
     if spec is None or spec.loader is None:
@@ -1147,6 +1401,7 @@ def load_custom_instructions(file_path: str) -> dict[str, type[Instruction]]:
                 f"Instruction '{name}' must be a subclass of Instruction, got {cls}"
             )
 
+    _CUSTOM_INSTRUCTIONS_CACHE[str(path)] = (version, instructions)
     return instructions
 
 
@@ -4,20 +4,20 @@ import time
 from collections import deque
 from typing import TYPE_CHECKING
 
-from dt31.assembler import assemble, extract_registers_from_program
+from dt31.assembler import assemble, extract_registers_from_program, thread
 from dt31.exceptions import AssemblyError, EndOfProgram
 from dt31.formatter import program_to_text
 from dt31.operands import (
+    KIND_MEMORY,
+    KIND_REGISTER,
     Label,
-    MemoryReference,
     Operand,
-    RegisterReference,
     validate_register_name,
 )
 from dt31.parser import BlankLine, Comment, parse_program
 
 if TYPE_CHECKING:
-    from dt31.instructions import Instruction  # pragma: no cover
+    from dt31.instructions import Handler, Instruction  # pragma: no cover
 
 
 class DT31:
@@ -93,6 +93,7 @@ class DT31:
         """Time spent executing instructions in nanoseconds (excludes debug waits)."""
         self.blocking_time_ns: int = 0
         """Time spent in waiting for blocking instructions in nanoseconds."""
+        self._threaded: list[Handler] = []
 
     @property
     def state(self):
@@ -103,9 +104,14 @@ class DT31:
                 and the stack contents.
         """
         state = {}
-        for k, v in enumerate(self.memory):
-            if v != 0:
-                state[f"M[{k}]"] = v
+        # Find nonzero cells at C speed: filter yields them in order, and each one is
+        # the first match for its value after the previous one, as the cells in
+        # between are all zero
+        memory = self.memory
+        k = -1
+        for v in filter(None, memory):
+            k = memory.index(v, k + 1)
+            state[f"M[{k}]"] = v
         state |= {f"R.{k}": v for k, v in self.registers.items()}
         state["stack"] = list(self.stack)
         return state
@@ -157,7 +163,8 @@ class DT31:
         Raises:
             ValueError: If arg is not a MemoryReference or RegisterReference.
         """
-        if isinstance(arg, (MemoryReference, RegisterReference)):
+        kind = getattr(arg, "KIND", None)
+        if kind == KIND_REGISTER or kind == KIND_MEMORY:
             return arg.resolve(self)
         else:
             raise ValueError(f"can't get item with type {type(arg)}")
@@ -172,10 +179,11 @@ class DT31:
         Raises:
             ValueError: If arg is not a MemoryReference or RegisterReference.
         """
-        if isinstance(arg, MemoryReference):
-            self.set_memory(arg.resolve_address(self), value)
-        elif isinstance(arg, RegisterReference):
-            self.set_register(arg.register, value)
+        kind = getattr(arg, "KIND", None)
+        if kind == KIND_REGISTER:
+            self.set_register(arg.register, value)  # type: ignore[attr-defined]
+        elif kind == KIND_MEMORY:
+            self.set_memory(arg.resolve_address(self), value)  # type: ignore[attr-defined]
         else:
             raise ValueError(f"can't get item with type {type(arg)}")
 
@@ -273,11 +281,20 @@ class DT31:
             raise RuntimeError(
                 "No program loaded. Call load() first or pass instructions."
             )
+        else:
+            # The loaded instructions may have been changed since they were threaded
+            self._thread_instructions()
 
         self.debug_mode = debug
         wall_start = time.perf_counter_ns()
         try:
             while True:
+                if not self.debug_mode:
+                    self._run_threaded()
+                    if not self.debug_mode:
+                        break
+                    # A breakpoint switched the CPU into debug mode
+                    input()
                 try:
                     self.step()
                     if self.debug_mode:
@@ -288,6 +305,34 @@ class DT31:
             wall_end = time.perf_counter_ns()
             self.wall_time_ns += wall_end - wall_start
 
+    def _thread_instructions(self):
+        """Compile the loaded instructions into the threaded code run by `run`."""
+        # Handlers read registers without checking names, so check them here
+        self.validate_program_registers(self.instructions)
+        self._threaded = thread(self.instructions)
+
+    def _run_threaded(self):
+        """Execute threaded code from the current instruction pointer.
+
+        Runs until the instruction pointer leaves the program or an instruction enables
+        debug mode. Keeps `ip`, `step_count` and `instruction_time_ns` in sync as `step`
+        would.
+        """
+        handlers = self._threaded
+        registers = self.registers
+        n = len(handlers)
+        ip = registers["ip"]
+        steps = 0
+        t0 = time.perf_counter_ns()
+        try:
+            while 0 <= ip < n and not self.debug_mode:
+                ip = handlers[ip](self, ip)
+                registers["ip"] = ip
+                steps += 1
+        finally:
+            self.instruction_time_ns += time.perf_counter_ns() - t0
+            self.step_count += steps
+
     def validate_program_registers(
         self, program: list[Instruction | Label | Comment | BlankLine]
     ) -> None:
@@ -341,6 +386,7 @@ class DT31:
         self.validate_program_registers(instructions)
         self.set_register("ip", 0)
         self.instructions = assemble(instructions)
+        self._threaded = thread(self.instructions)
 
     def step(self, debug: bool | None = None):
         """Execute a single instruction at the current instruction pointer.
@@ -355,11 +401,12 @@ class DT31:
         if debug is None:
             debug = self.debug_mode
 
-        if self.get_register("ip") >= len(self.instructions):
+        ip = self.registers["ip"]
+        if ip >= len(self.instructions):
             raise EndOfProgram("No more instructions")
-        if self.get_register("ip") < 0:
+        if ip < 0:
             raise EndOfProgram("Cannot load negative instructions")
-        instruction = self.instructions[self.get_register("ip")]
+        instruction = self.instructions[ip]
 
         # Track instruction timing
         t0 = time.perf_counter_ns()
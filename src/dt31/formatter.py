@@ -131,31 +131,106 @@ def program_to_text(
         #     NOUT R.a, 0
         ```
     """
+    # Render each instruction once; the text is reused when measuring for alignment.
+    # Other items get None, which also tells _program_lines what they are
+    instruction_texts = [
+        None
+        if isinstance(item, (Label, Comment, BlankLine))
+        else (item.to_concise_str() if hide_default_args else str(item))
+        for item in program
+    ]
+
     # Auto-calculate comment column if not specified
     if align_comments and comment_column is None and not strip_comments:
-        # Generate program without comments to measure instruction widths
-        stripped_text = program_to_text(
+        # Lay out the program without comments to measure instruction widths
+        stripped_lines = _program_lines(
             program,
+            instruction_texts,
             indent_size=indent_size,
             label_inline=label_inline,
             blank_lines=blank_lines,
+            align_comments=False,
+            comment_column=None,
+            comment_margin=comment_margin,
             strip_comments=True,  # Remove comments for measurement
-            hide_default_args=hide_default_args,
         )
 
         # Find longest line
-        max_length = max((len(line) for line in stripped_text.splitlines()), default=0)
+        max_length = max((len(line) for line in stripped_lines), default=0)
 
         # Calculate comment column
         comment_column = max_length + comment_margin
 
+    lines = _program_lines(
+        program,
+        instruction_texts,
+        indent_size=indent_size,
+        label_inline=label_inline,
+        blank_lines=blank_lines,
+        align_comments=align_comments,
+        comment_column=comment_column,
+        comment_margin=comment_margin,
+        strip_comments=strip_comments,
+    )
+    result = "\n".join(lines)
+
+    # Ensure trailing newline (POSIX standard for text files)
+    if result and not result.endswith("\n"):
+        result += "\n"
+
+    return result
+
+
+def _program_lines(
+    program: list[Instruction | Label | Comment | BlankLine] | list[Instruction],
+    instruction_texts: list[str | None],
+    *,
+    indent_size: int,
+    label_inline: bool,
+    blank_lines: Literal["auto", "preserve", "none"],
+    align_comments: bool,
+    comment_column: int | None,
+    comment_margin: int,
+    strip_comments: bool,
+) -> list[str]:
+    """Lay out a program as lines of text, given the rendered text of its instructions.
+
+    See `program_to_text` for the meaning of the formatting options.
+    """
     indent = " " * indent_size
+    margin = " " * comment_margin
     lines = []
     pending_labels: list[Label] = []
     prev_was_label = False
 
-    for item in program:
-        if isinstance(item, BlankLine):
+    for item, instruction_text in zip(program, instruction_texts):
+        if instruction_text is not None:
+            # Instruction (the most common item, so checked first)
+            prev_was_label = False
+
+            # Handle pending inline labels
+            if pending_labels:
+                label_prefix = " ".join(f"{lbl.name}:" for lbl in pending_labels) + " "
+                # Comments from inline labels are handled by the instruction comment
+                # (use the instruction's comment if it exists, otherwise use last label's comment)
+                if strip_comments:
+                    comment = ""
+                else:
+                    comment = item.comment or pending_labels[-1].comment or ""
+                pending_labels = []
+            else:
+                label_prefix = indent
+                comment = "" if strip_comments else item.comment
+
+            line = _format_instruction_with_comment(
+                label_prefix + instruction_text,
+                comment,
+                align_comments,
+                comment_column,
+                margin,
+            )
+            lines.append(line)
+        elif isinstance(item, BlankLine):
             # Preserve blank lines only if blank_lines is "preserve"
             if blank_lines == "preserve":
                 lines.append("")
@@ -184,68 +259,35 @@ def program_to_text(
                     item,
                     align_comments,
                     comment_column,
-                    comment_margin,
+                    margin,
                     strip_comments,
                 )
                 lines.append(line)
 
             prev_was_label = True
-        else:
-            # Instruction
-            prev_was_label = False
-
-            # Handle pending inline labels
-            if pending_labels:
-                label_prefix = " ".join(f"{lbl.name}:" for lbl in pending_labels) + " "
-                # Comments from inline labels are handled by the instruction comment
-                # (use the instruction's comment if it exists, otherwise use last label's comment)
-                if strip_comments:
-                    comment = ""
-                else:
-                    comment = item.comment or pending_labels[-1].comment or ""
-                pending_labels = []
-            else:
-                label_prefix = indent
-                comment = "" if strip_comments else item.comment
-
-            instruction_text = item.to_concise_str() if hide_default_args else str(item)
-            line = _format_instruction_with_comment(
-                label_prefix + instruction_text,
-                comment,
-                align_comments,
-                comment_column,
-                comment_margin,
-            )
-            lines.append(line)
 
     # Handle any remaining labels at end of program
     for lbl in pending_labels:
         line = _format_label(
-            lbl, align_comments, comment_column, comment_margin, strip_comments
+            lbl, align_comments, comment_column, margin, strip_comments
         )
         lines.append(line)
 
-    result = "\n".join(lines)
-
-    # Ensure trailing newline (POSIX standard for text files)
-    if result and not result.endswith("\n"):
-        result += "\n"
-
-    return result
+    return lines
 
 
 def _format_label(
     label: Label,
     align_comments: bool,
     comment_column: int | None,
-    comment_margin: int,
+    margin: str,
     strip_comments: bool = False,
 ) -> str:
     """Format a label with optional comment alignment."""
     line = f"{label.name}:"
     if label.comment and not strip_comments:
         line = _format_instruction_with_comment(
-            line, label.comment, align_comments, comment_column, comment_margin
+            line, label.comment, align_comments, comment_column, margin
         )
     return line
 
@@ -255,20 +297,20 @@ def _format_instruction_with_comment(
     comment: str,
     align_comments: bool,
     comment_column: int | None,
-    comment_margin: int,
+    margin: str,
 ) -> str:
-    """Format an instruction with its comment, handling alignment if requested."""
+    """Format an instruction with its comment, handling alignment if requested.
+
+    `margin` is the whitespace put before the comment when it isn't aligned.
+    """
     if not comment:
         return instruction_text
 
-    if align_comments and comment_column is not None:
-        current_len = len(instruction_text)
-        if current_len < comment_column:
-            padding = comment_column - current_len
-            return f"{instruction_text}{' ' * padding}; {comment}"
-        else:
-            # Instruction exceeds column, fall back to margin
-            return f"{instruction_text}{' ' * comment_margin}; {comment}"
-    else:
-        # No alignment, just use margin
-        return f"{instruction_text}{' ' * comment_margin}; {comment}"
+    if (
+        align_comments
+        and comment_column is not None
+        and len(instruction_text) < comment_column
+    ):
+        return f"{instruction_text.ljust(comment_column)}; {comment}"
+    # No alignment, or instruction exceeds column: just use margin
+    return f"{instruction_text}{margin}; {comment}"
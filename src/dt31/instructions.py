@@ -1,16 +1,22 @@
 from __future__ import annotations
 
 import copy
+import functools
+import operator
 import random
-from typing import TYPE_CHECKING
+import sys
+import time
+from typing import TYPE_CHECKING, Callable
 
 from dt31.operands import (
     Destination,
     L,
     Label,
+    Literal,
     MemoryReference,
     Operand,
     Reference,
+    RegisterReference,
     as_op,
 )
 
@@ -19,6 +25,38 @@ if TYPE_CHECKING:
 
 INPUT_PROMPT = "> "
 
+Handler = Callable[["DT31", int], int]
+"""A threaded-code handler: `handler(cpu, ip)` executes the instruction at `ip` and
+returns the instruction pointer to continue from."""
+
+
+def sequential(handler: Handler) -> Handler:
+    """Mark a handler as always continuing at `ip + 1`.
+
+    Sequential handlers can be fused with the handler that follows them (see
+    `dt31.assembler.thread`).
+
+    Args:
+        handler: A handler that never jumps.
+
+    Returns:
+        The same handler.
+    """
+    handler.sequential = True  # type: ignore[attr-defined]
+    return handler
+
+
+def is_sequential(handler: Handler) -> bool:
+    """Check whether a handler was marked with `sequential`."""
+    return getattr(handler, "sequential", False)
+
+
+def _references_ip(operand: object) -> bool:
+    """Check whether an operand reads the `ip` register, including inside an address."""
+    while isinstance(operand, MemoryReference):
+        operand = operand.address
+    return isinstance(operand, RegisterReference) and operand.register == "ip"
+
 
 class Instruction:
     """Base class for all DT31 instructions.
@@ -48,12 +86,16 @@ class Instruction:
     - `_calc(cpu)`: Perform the instruction's operation and return a result value.
       This value is available to the instruction but typically only used for operations
       that need to store results (via `NullaryOperation`,`BinaryOperation` or `UnaryOperation`
-      base classes).
+      base classes). Subclasses of `UnaryOperation` and `BinaryOperation` whose result
+      only depends on their operands' values can define a static `_op` function of
+      those values instead, which lets `DT31.run` skip generic operand resolution.
     - `_advance(cpu)` (optional): Override to customize how the instruction pointer moves.
       Default behavior increments IP by 1. Jump instructions override this to modify
       control flow.
     - `__str__()` (optional): Return a human-readable representation showing the
       instruction name and operands for debugging and display purposes.
+    - `OPERAND_ATTRS` (optional): A tuple naming the attributes that hold operands.
+      If omitted, all attributes are inspected when analysing programs.
 
     Consult the source of existing instructions as a guide.
 
@@ -72,6 +114,19 @@ class Instruction:
     ```
     """
 
+    OPERAND_ATTRS: tuple[str, ...] | None = ()
+    """Names of the attributes holding the instruction's operands.
+
+    Used for static analysis such as `dt31.assembler.extract_registers_from_program`.
+    Instruction classes defined outside this module get `None` unless they declare their
+    own, meaning every attribute is inspected for operands.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "OPERAND_ATTRS" not in cls.__dict__ and cls.__module__ != __name__:
+            cls.OPERAND_ATTRS = None
+
     def __init__(self, name: str):
         """Initialize an Instruction.
 
@@ -121,7 +176,7 @@ class Instruction:
             cpu: The DT31 CPU instance executing this instruction.
         """
         # default behavior is to increment the instruction register by 1
-        cpu.set_register("ip", cpu.get_register("ip") + 1)
+        cpu.registers["ip"] += 1
 
     def __call__(self, cpu: DT31) -> int:
         """Execute the instruction on the given CPU.
@@ -170,6 +225,53 @@ class Instruction:
         """
         return str(self)
 
+    def compile_threaded(self) -> Handler:
+        """Compile the instruction into a threaded-code handler.
+
+        A handler is a function `handler(cpu, ip)` that executes this instruction, located
+        at position `ip` of the loaded program, and returns the instruction pointer to
+        continue from. The `ip` register holds `ip` when the handler is called. `DT31.run`
+        dispatches through a list of handlers (see `dt31.assembler.thread`) instead of
+        calling `DT31.step` for every instruction.
+
+        The default handler calls the instruction and reads back the `ip` register, so it
+        works for any instruction. Base classes such as `BinaryOperation` and `Jump`
+        override this to return handlers that skip the `__call__`/`_advance` chain.
+
+        Returns:
+            A handler executing this instruction.
+        """
+        if self.is_blocking:
+
+            def handler(cpu: DT31, ip: int) -> int:
+                t0 = time.perf_counter_ns()
+                self(cpu)
+                cpu.blocking_time_ns += time.perf_counter_ns() - t0
+                return cpu.registers["ip"]
+
+        else:
+
+            def handler(cpu: DT31, ip: int) -> int:
+                self(cpu)
+                return cpu.registers["ip"]
+
+        return handler
+
+    def clone(self) -> Instruction:
+        """Create a shallow copy of the instruction.
+
+        The copy has its own attribute dict but shares operand objects with the original.
+        This is much cheaper than `copy.deepcopy` and is safe as long as operands are
+        replaced rather than mutated, which is what `dt31.assembler.assemble` does when
+        resolving labels.
+
+        Returns:
+            A new Instruction instance of the same type with the same attributes.
+        """
+        new_inst = object.__new__(type(self))
+        new_inst.__dict__ = self.__dict__.copy()
+        return new_inst
+
     def with_comment(self, text: str) -> Instruction:
         """Create a new instruction with the specified comment.
 
@@ -201,11 +303,203 @@ class NOOP(Instruction):
     def _calc(self, cpu: DT31) -> int:
         return 0
 
+    def compile_threaded(self) -> Handler:
+        cls = type(self)
+        if (
+            cls.__call__ is not Instruction.__call__
+            or cls._advance is not Instruction._advance
+            or cls._calc is not NOOP._calc
+        ):
+            return super().compile_threaded()
+
+        def handler(cpu: DT31, ip: int) -> int:
+            return ip + 1
+
+        return sequential(handler)
+
+
+def _compile_operation(
+    inst: NullaryOperation | UnaryOperation | BinaryOperation, base: type[Instruction]
+) -> Handler:
+    """Compile a handler storing the result of `inst._calc` in `inst.out`.
+
+    Falls back to the generic handler if the instruction customizes `__call__` or
+    `_advance`, blocks on input, or its output references the `ip` register at any
+    depth: `__call__` advances before storing, so such outputs see the next position.
+    """
+    cls = type(inst)
+    out = inst.out
+    if (
+        cls.__call__ is not base.__call__
+        or cls._advance is not Instruction._advance
+        or inst.is_blocking
+        or _references_ip(out)
+    ):
+        return Instruction.compile_threaded(inst)
+
+    return sequential(_generate_handler(inst, base))
+
+
+_OP_EXPRESSIONS: dict[Callable[..., int], str] = {}
+"""Python expressions equivalent to built-in `_op` functions, keyed by the function.
+
+Populated once the operation classes are defined. Used by `_generate_handler`, so an
+instruction whose class replaces `_op` falls back to calling it."""
+
+_HANDLER_FACTORIES: dict[
+    tuple[str, tuple[str, ...], tuple[str, ...], str], Callable[..., Handler]
+] = {}
+"""Compiled handler factories, keyed by expression, operand kinds, extra argument names
+and output kind."""
+
+
+def _generate_handler(
+    inst: NullaryOperation | UnaryOperation | BinaryOperation, base: type[Instruction]
+) -> Handler:
+    """Generate a handler computing the operation and storing it in `inst.out`.
+
+    Rather than composing closures (handler, `_calc`, `_op`), this compiles Python
+    source for the whole instruction, so executing it is a single call. Built-in `_op`
+    functions are inlined as expressions and operands are read according to their kind:
+    literals are baked in as constants and registers read the register dict directly
+    (register names are validated when a program is loaded). Other operands go through
+    their specialized resolver. If every operand is a literal, the result is folded
+    into a constant, unless computing it raises, in which case the error is left for
+    run time. Instructions whose class defines an unknown `_op` call it, and those that
+    don't define `_op` or override `_calc` call their own `_calc`.
+
+    Source is compiled once per expression and combination of operand kinds, and the
+    resulting factory is called with each instruction's register names, literal values
+    and resolvers.
+    """
+    cls = type(inst)
+    op = getattr(cls, "_op", None)
+    if base is NullaryOperation:
+        operands = []
+    elif base is UnaryOperation:
+        operands = [inst.a]
+    else:
+        operands = [inst.a, inst.b]
+
+    extras: dict[str, object] = {}
+    if op is None or cls._calc is not base._calc:
+        expression = "calc(cpu)"
+        extras["calc"] = inst._calc
+        operands = []
+    else:
+        expression = _OP_EXPRESSIONS.get(op)
+        if expression is None:
+            expression = f"op({', '.join(['{a}', '{b}'][: len(operands)])})"
+            extras["op"] = op
+        if all(type(operand) is Literal for operand in operands):
+            try:
+                extras = {"const": op(*(operand.value for operand in operands))}
+            except (ArithmeticError, ValueError):
+                pass
+            else:
+                expression = "const"
+                operands = []
+
+    kinds, args = _operand_layout(operands)
+    args.extend(extras.values())
+    out = inst.out
+    if isinstance(out, RegisterReference):
+        out_kind = "register"
+        args.append(out.register)
+    else:
+        out_kind = "memory"
+        args.append(
+            out.address.specialize()
+            if type(out) is MemoryReference
+            else out.resolve_address
+        )
+
+    key = (expression, kinds, tuple(extras), out_kind)
+    factory = _HANDLER_FACTORIES.get(key)
+    if factory is None:
+        factory = _HANDLER_FACTORIES[key] = _compile_handler_factory(*key)
+    return factory(*args)
+
+
+def _operand_layout(
+    operands: list[Operand],
+) -> tuple[tuple[str, ...], list[object]]:
+    """Classify operands for generated handlers.
+
+    Returns:
+        The kind of each operand ("register", "literal" or "resolve") and the matching
+        factory arguments: a register name, literal value or specialized resolver.
+    """
+    kinds = []
+    args: list[object] = []
+    for operand in operands:
+        if type(operand) is RegisterReference:
+            kinds.append("register")
+            args.append(operand.register)
+        elif type(operand) is Literal:
+            kinds.append("literal")
+            args.append(operand.value)
+        else:
+            kinds.append("resolve")
+            args.append(operand.specialize())
+    return tuple(kinds), args
+
+
+def _operand_atoms(names: list[str], kinds: tuple[str, ...]) -> dict[str, str]:
+    """Get the source reading each named factory argument, according to its kind."""
+    return {
+        name: {
+            "register": f"registers[{name}]",
+            "literal": name,
+            "resolve": f"{name}(cpu)",
+        }[kind]
+        for name, kind in zip(names, kinds)
+    }
+
+
+def _compile_handler_factory(
+    expression: str, kinds: tuple[str, ...], extras: tuple[str, ...], out_kind: str
+) -> Callable[..., Handler]:
+    """Compile a factory building handlers for one expression and operand layout.
+
+    The factory takes one argument per operand (a register name, literal value or
+    resolver, according to its kind), then the extra names used by the expression
+    (such as `op` or `calc`), then the output register name or address resolver.
+    """
+    names = ["a", "b"][: len(kinds)]
+    atoms = _operand_atoms(names, kinds)
+    if out_kind == "register":
+        store = f"registers[out] = {expression.format(**atoms)}"
+    else:
+        # Compute the value before the address, and leave ip past the instruction if
+        # the store fails, as `__call__` advances before storing
+        store = (
+            f"value = {expression.format(**atoms)}\n"
+            "        try:\n"
+            "            cpu.set_memory(out(cpu), value)\n"
+            "        except BaseException:\n"
+            '            registers["ip"] = ip + 1\n'
+            "            raise"
+        )
+    source = (
+        f"def factory({', '.join([*names, *extras, 'out'])}):\n"
+        "    def handler(cpu, ip):\n"
+        "        registers = cpu.registers\n"
+        f"        {store}\n"
+        "        return ip + 1\n"
+        "    return handler\n"
+    )
+    namespace: dict[str, Callable[..., Handler]] = {}
+    exec(compile(source, f"<dt31 handler: {expression}>", "exec"), namespace)
+    return namespace["factory"]
+
 
 class NullaryOperation(Instruction):
     """Base class for instructions which take no input operands and write to an output
     operand."""
 
+    OPERAND_ATTRS = ("out",)
+
     out: Reference  # Always set to a Reference in __init__
 
     def __init__(self, name: str, out: Reference):
@@ -222,10 +516,16 @@ class NullaryOperation(Instruction):
         self.out = out
 
     def __call__(self, cpu: DT31) -> int:
-        value = super().__call__(cpu)
+        # Inlines Instruction.__call__; the result is written after advancing, so an
+        # `out` of R.ip takes precedence
+        value = self._calc(cpu)
+        self._advance(cpu)
         cpu[self.out] = value
         return value
 
+    def compile_threaded(self) -> Handler:
+        return _compile_operation(self, NullaryOperation)
+
     def __repr__(self) -> str:
         """Return Python API representation."""
         return f"{self.name}(out={self.out!r})"
@@ -237,17 +537,25 @@ class NullaryOperation(Instruction):
 
 class UnaryOperation(Instruction):
     """Base class for instructions which utilize a single operand and optionally write
-    to a separate operand."""
+    to a separate operand.
+
+    Subclasses either implement `_calc` or, if the result only depends on the operand's
+    value, define `_op` as a pure function of that value. Instructions defined via `_op`
+    get handlers with operand resolution specialized by operand kind when threaded.
+    """
+
+    OPERAND_ATTRS = ("a", "out")
 
     out: Reference  # Always set to a Reference in __init__
+    _op: Callable[[int], int] | None = None
 
     def __init__(self, name: str, a: Operand | int, out: Reference | None = None):
         super().__init__(name)
         self.a = as_op(a)
-        if not isinstance(out, (type(None), Reference)):
-            raise ValueError("argument `out` must be a Reference or None")
-        if out is not None:
+        if isinstance(out, Reference):
             self.out = out
+        elif out is not None:
+            raise ValueError("argument `out` must be a Reference or None")
         elif isinstance(self.a, Reference):
             self.out = self.a
         else:
@@ -255,11 +563,20 @@ class UnaryOperation(Instruction):
                 f"{self.name} must be called with a reference as operand `out` or a reference as operand `a`"
             )
 
+    def _calc(self, cpu: DT31) -> int:
+        if self._op is None:
+            raise NotImplementedError()
+        return self._op(self.a.resolve(cpu))
+
     def __call__(self, cpu: DT31) -> int:
-        value = super().__call__(cpu)
+        value = self._calc(cpu)
+        self._advance(cpu)
         cpu[self.out] = value
         return value
 
+    def compile_threaded(self) -> Handler:
+        return _compile_operation(self, UnaryOperation)
+
     def __repr__(self) -> str:
         """Return Python API representation."""
         return f"{self.name}(a={self.a!r}, out={self.out!r})"
@@ -285,9 +602,17 @@ class UnaryOperation(Instruction):
 # ---------------------------------- bitwise and alu --------------------------------- #
 class BinaryOperation(Instruction):
     """Base class for instructions which utilize two operands and optionally write
-    to a separate operand."""
+    to a separate operand.
+
+    Subclasses either implement `_calc` or, if the result only depends on the operands'
+    values, define `_op` as a pure function of those values. Instructions defined via
+    `_op` get handlers with operand resolution specialized by operand kind when threaded.
+    """
+
+    OPERAND_ATTRS = ("a", "b", "out")
 
     out: Reference  # Always set to a Reference in __init__
+    _op: Callable[[int, int], int] | None = None
 
     def __init__(
         self,
@@ -301,10 +626,10 @@ class BinaryOperation(Instruction):
         super().__init__(name)
         self.a = as_op(a)
         self.b = as_op(b)
-        if not isinstance(out, (type(None), Reference)):
-            raise ValueError("argument `out` must be a Reference or None")
         if isinstance(out, Reference):
             self.out = out
+        elif out is not None:
+            raise ValueError("argument `out` must be a Reference or None")
         elif isinstance(self.a, Reference):
             self.out = self.a
         else:
@@ -312,11 +637,20 @@ class BinaryOperation(Instruction):
                 f"{self.name} must be called with a reference as operand `out` or a reference as operand `a`"
             )
 
+    def _calc(self, cpu: DT31) -> int:
+        if self._op is None:
+            raise NotImplementedError()
+        return self._op(self.a.resolve(cpu), self.b.resolve(cpu))
+
     def __call__(self, cpu: DT31) -> int:
-        value = super().__call__(cpu)
+        value = self._calc(cpu)
+        self._advance(cpu)
         cpu[self.out] = value
         return value
 
+    def compile_threaded(self) -> Handler:
+        return _compile_operation(self, BinaryOperation)
+
     def __repr__(self) -> str:
         """Return Python API representation."""
         return f"{self.name}(a={self.a!r}, b={self.b!r}, out={self.out!r})"
@@ -354,8 +688,7 @@ class ADD(BinaryOperation):
         """
         super().__init__("ADD", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return self.a.resolve(cpu) + self.b.resolve(cpu)
+    _op = staticmethod(operator.add)
 
 
 class SUB(BinaryOperation):
@@ -373,8 +706,7 @@ class SUB(BinaryOperation):
         """
         super().__init__("SUB", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return self.a.resolve(cpu) - self.b.resolve(cpu)
+    _op = staticmethod(operator.sub)
 
 
 class MUL(BinaryOperation):
@@ -392,8 +724,7 @@ class MUL(BinaryOperation):
         """
         super().__init__("MUL", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return self.a.resolve(cpu) * self.b.resolve(cpu)
+    _op = staticmethod(operator.mul)
 
 
 class DIV(BinaryOperation):
@@ -411,8 +742,7 @@ class DIV(BinaryOperation):
         """
         super().__init__("DIV", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return self.a.resolve(cpu) // self.b.resolve(cpu)
+    _op = staticmethod(operator.floordiv)
 
 
 class MOD(BinaryOperation):
@@ -430,8 +760,7 @@ class MOD(BinaryOperation):
         """
         super().__init__("MOD", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return self.a.resolve(cpu) % self.b.resolve(cpu)
+    _op = staticmethod(operator.mod)
 
 
 class BSL(BinaryOperation):
@@ -449,8 +778,7 @@ class BSL(BinaryOperation):
         """
         super().__init__("BSL", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return self.a.resolve(cpu) << self.b.resolve(cpu)
+    _op = staticmethod(operator.lshift)
 
 
 class BSR(BinaryOperation):
@@ -468,8 +796,7 @@ class BSR(BinaryOperation):
         """
         super().__init__("BSR", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return self.a.resolve(cpu) >> self.b.resolve(cpu)
+    _op = staticmethod(operator.rshift)
 
 
 class BAND(BinaryOperation):
@@ -487,8 +814,7 @@ class BAND(BinaryOperation):
         """
         super().__init__("BAND", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return self.a.resolve(cpu) & self.b.resolve(cpu)
+    _op = staticmethod(operator.and_)
 
 
 class BOR(BinaryOperation):
@@ -506,8 +832,7 @@ class BOR(BinaryOperation):
         """
         super().__init__("BOR", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return self.a.resolve(cpu) | self.b.resolve(cpu)
+    _op = staticmethod(operator.or_)
 
 
 class BXOR(BinaryOperation):
@@ -525,8 +850,7 @@ class BXOR(BinaryOperation):
         """
         super().__init__("BXOR", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return self.a.resolve(cpu) ^ self.b.resolve(cpu)
+    _op = staticmethod(operator.xor)
 
 
 class BNOT(UnaryOperation):
@@ -541,8 +865,7 @@ class BNOT(UnaryOperation):
         """
         super().__init__("BNOT", a, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return ~self.a.resolve(cpu)
+    _op = staticmethod(operator.invert)
 
 
 # ------------------------------------ comparisons ----------------------------------- #
@@ -561,8 +884,9 @@ class LT(BinaryOperation):
         """
         super().__init__("LT", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return int(self.a.resolve(cpu) < self.b.resolve(cpu))
+    @staticmethod
+    def _op(a: int, b: int) -> int:
+        return 1 if a < b else 0
 
 
 class GT(BinaryOperation):
@@ -580,8 +904,9 @@ class GT(BinaryOperation):
         """
         super().__init__("GT", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return int(self.a.resolve(cpu) > self.b.resolve(cpu))
+    @staticmethod
+    def _op(a: int, b: int) -> int:
+        return 1 if a > b else 0
 
 
 class LE(BinaryOperation):
@@ -599,8 +924,9 @@ class LE(BinaryOperation):
         """
         super().__init__("LE", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return int(self.a.resolve(cpu) <= self.b.resolve(cpu))
+    @staticmethod
+    def _op(a: int, b: int) -> int:
+        return 1 if a <= b else 0
 
 
 class GE(BinaryOperation):
@@ -618,8 +944,9 @@ class GE(BinaryOperation):
         """
         super().__init__("GE", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return int(self.a.resolve(cpu) >= self.b.resolve(cpu))
+    @staticmethod
+    def _op(a: int, b: int) -> int:
+        return 1 if a >= b else 0
 
 
 class EQ(BinaryOperation):
@@ -637,8 +964,9 @@ class EQ(BinaryOperation):
         """
         super().__init__("EQ", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return int(self.a.resolve(cpu) == self.b.resolve(cpu))
+    @staticmethod
+    def _op(a: int, b: int) -> int:
+        return 1 if a == b else 0
 
 
 class NE(BinaryOperation):
@@ -656,8 +984,9 @@ class NE(BinaryOperation):
         """
         super().__init__("NE", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return int(self.a.resolve(cpu) != self.b.resolve(cpu))
+    @staticmethod
+    def _op(a: int, b: int) -> int:
+        return 1 if a != b else 0
 
 
 # ---------------------------------- pythonic logic ---------------------------------- #
@@ -714,10 +1043,9 @@ class XOR(BinaryOperation):
         """
         super().__init__("XOR", a, b, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        a = self.a.resolve(cpu)
-        b = self.b.resolve(cpu)
-        return int((a and not b) or (b and not a))
+    @staticmethod
+    def _op(a: int, b: int) -> int:
+        return 1 if (not a) is not (not b) else 0
 
 
 class NOT(UnaryOperation):
@@ -732,14 +1060,56 @@ class NOT(UnaryOperation):
         """
         super().__init__("NOT", a, out)
 
-    def _calc(self, cpu: DT31) -> int:
-        return int(not self.a.resolve(cpu))
+    @staticmethod
+    def _op(a: int) -> int:
+        return 0 if a else 1
+
+
+_OP_EXPRESSIONS.update(
+    {
+        ADD._op: "{a} + {b}",
+        SUB._op: "{a} - {b}",
+        MUL._op: "{a} * {b}",
+        DIV._op: "{a} // {b}",
+        MOD._op: "{a} % {b}",
+        BSL._op: "{a} << {b}",
+        BSR._op: "{a} >> {b}",
+        BAND._op: "{a} & {b}",
+        BOR._op: "{a} | {b}",
+        BXOR._op: "{a} ^ {b}",
+        BNOT._op: "~{a}",
+        LT._op: "1 if {a} < {b} else 0",
+        GT._op: "1 if {a} > {b} else 0",
+        LE._op: "1 if {a} <= {b} else 0",
+        GE._op: "1 if {a} >= {b} else 0",
+        EQ._op: "1 if {a} == {b} else 0",
+        NE._op: "1 if {a} != {b} else 0",
+        XOR._op: "1 if (not {a}) is not (not {b}) else 0",
+        NOT._op: "0 if {a} else 1",
+    }
+)
 
 
 # --------------------------------------- jumps -------------------------------------- #
+JUMP_CLASSES: set[type[Jump]] = set()
+"""All subclasses of `Jump`, registered when defined.
+
+Used by the assembler to find instructions whose `dest` may need label resolution with
+a single set lookup on the instruction's type."""
+
+
 class Jump(Instruction):
     """Base class for various types of jump instruction."""
 
+    OPERAND_ATTRS = ("dest",)
+
+    is_relative: bool = False
+    """If `True`, `dest` is an offset from the jump's own position."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        JUMP_CLASSES.add(cls)
+
     def __init__(self, name: str, dest: Destination):
         """
         Args:
@@ -763,10 +1133,43 @@ class Jump(Instruction):
         return 0
 
     def _advance(self, cpu: DT31):
+        # The ip register always exists, so skip set_register's name check
         if self._jump_condition(cpu):
-            cpu.set_register("ip", self._jump_destination(cpu))
+            cpu.registers["ip"] = self._jump_destination(cpu)
+        else:
+            cpu.registers["ip"] += 1
+
+    def compile_threaded(self) -> Handler:
+        cls = type(self)
+        if (
+            cls.__call__ is not Instruction.__call__
+            or cls._advance is not Jump._advance
+            or self.is_blocking
+        ):
+            return super().compile_threaded()
+
+        condition = self._jump_condition
+        destination = self._jump_destination
+        if cls._calc is Jump._calc:
+            handler = _generate_jump_handler(self)
+            if handler is not None:
+                return handler
+
+            def handler(cpu: DT31, ip: int) -> int:
+                if condition(cpu):
+                    return destination(cpu)
+                return ip + 1
+
         else:
-            cpu.set_register("ip", cpu.get_register("ip") + 1)
+            calc = self._calc
+
+            def handler(cpu: DT31, ip: int) -> int:
+                calc(cpu)
+                if condition(cpu):
+                    return destination(cpu)
+                return ip + 1
+
+        return handler
 
     def __repr__(self) -> str:
         """Return Python API representation."""
@@ -782,6 +1185,8 @@ class Jump(Instruction):
 class UnaryJump(Jump):
     """Base class for conditions which use a single value to determine jumps."""
 
+    OPERAND_ATTRS = ("dest", "a")
+
     def __init__(self, name: str, dest: Destination, a: Operand | int):
         """
         Args:
@@ -804,6 +1209,8 @@ class UnaryJump(Jump):
 class BinaryJump(Jump):
     """Base class for conditions which use two values to determine jumps."""
 
+    OPERAND_ATTRS = ("dest", "a", "b")
+
     def __init__(
         self, name: str, dest: Destination, a: Operand | int, b: Operand | int
     ):
@@ -845,8 +1252,10 @@ class RelativeJumpMixin(Jump):
     relative to the current instruction pointer position, rather than an exact position.
     """
 
+    is_relative = True
+
     def _jump_destination(self, cpu: DT31) -> int:
-        return cpu.get_register("ip") + self.dest.resolve(cpu)
+        return cpu.registers["ip"] + self.dest.resolve(cpu)
 
 
 class UnconditionalJumpMixin(Jump):
@@ -947,6 +1356,337 @@ class IfJumpMixin(UnaryJump):
         return bool(self.a.resolve(cpu))
 
 
+_JUMP_CONDITIONS: dict[Callable[..., bool], str] = {
+    UnconditionalJumpMixin._jump_condition: "True",
+    IfEqualJumpMixin._jump_condition: "{a} == {b}",
+    IfUnequalJumpMixin._jump_condition: "{a} != {b}",
+    IfGTJumpMixin._jump_condition: "{a} > {b}",
+    IfGEJumpMixin._jump_condition: "{a} >= {b}",
+    IfLTJumpMixin._jump_condition: "{a} < {b}",
+    IfLEJumpMixin._jump_condition: "{a} <= {b}",
+    IfJumpMixin._jump_condition: "{a}",
+}
+"""Python expressions equivalent to built-in `_jump_condition` methods."""
+
+_JUMP_DESTINATIONS: dict[Callable[..., int], str] = {
+    ExactJumpMixin._jump_destination: "{dest}",
+    RelativeJumpMixin._jump_destination: "ip + {dest}",
+}
+"""Python expressions equivalent to built-in `_jump_destination` methods."""
+
+_JUMP_HANDLER_FACTORIES: dict[
+    tuple[str, str, tuple[str, ...]], Callable[..., Handler]
+] = {}
+"""Compiled jump handler factories, keyed by condition, destination and operand kinds."""
+
+
+def _generate_jump_handler(inst: Jump) -> Handler | None:
+    """Generate a handler with the jump's condition and destination inlined.
+
+    The jump counterpart of `_generate_handler`: rather than calling the bound
+    `_jump_condition` and `_jump_destination` methods, each of which resolves its
+    operands, the handler tests the condition and computes the destination in one call.
+
+    Returns:
+        The handler, or None if the jump's class replaces its condition or destination
+        with one that has no known expression.
+    """
+    cls = type(inst)
+    condition = _JUMP_CONDITIONS.get(cls._jump_condition)
+    destination = _JUMP_DESTINATIONS.get(cls._jump_destination)
+    if condition is None or destination is None or isinstance(inst.dest, Label):
+        return None
+
+    operands = [inst.dest]
+    if "{b}" in condition:
+        operands += [inst.a, inst.b]
+    elif "{a}" in condition:
+        operands.append(inst.a)
+    kinds, args = _operand_layout(operands)
+
+    key = (condition, destination, kinds)
+    factory = _JUMP_HANDLER_FACTORIES.get(key)
+    if factory is None:
+        factory = _JUMP_HANDLER_FACTORIES[key] = _compile_jump_handler_factory(*key)
+    return factory(*args)
+
+
+def _compile_jump_handler_factory(
+    condition: str, destination: str, kinds: tuple[str, ...]
+) -> Callable[..., Handler]:
+    """Compile a factory building jump handlers for one condition and operand layout.
+
+    The factory takes one argument for the destination, then one per condition
+    operand, each a register name, literal value or resolver according to its kind.
+    """
+    names = ["dest", "a", "b"][: len(kinds)]
+    atoms = _operand_atoms(names, kinds)
+    target = destination.format(**atoms)
+    # Unconditional jumps on literal destinations never read a register
+    body = "        registers = cpu.registers\n" if "register" in kinds else ""
+    if condition == "True":
+        body += f"        return {target}\n"
+    else:
+        body += (
+            f"        if {condition.format(**atoms)}:\n"
+            f"            return {target}\n"
+            "        return ip + 1\n"
+        )
+    source = (
+        f"def factory({', '.join(names)}):\n"
+        "    def handler(cpu, ip):\n"
+        f"{body}"
+        "    return handler\n"
+    )
+    namespace: dict[str, Callable[..., Handler]] = {}
+    exec(compile(source, f"<dt31 jump handler: {condition}>", "exec"), namespace)
+    return namespace["factory"]
+
+
+_BRANCH_HANDLER_FACTORIES: dict[
+    tuple[str, tuple[str, ...], bool, bool], Callable[..., Handler]
+] = {}
+"""Compiled compare-and-branch factories, keyed by comparison expression, operand
+kinds, whether the branch is taken on a false result and whether it is relative."""
+
+
+def fuse_compare_branch(compare: Instruction, jump: Instruction) -> Handler | None:
+    """Fuse a comparison and a following branch on its result into one handler.
+
+    Matches a built-in comparison (`LT`, `GT`, `LE`, `GE`, `EQ`, `NE`) storing to a
+    register, followed by `JIF`/`RJIF` on that register or `JEQ`/`JNE` (and their
+    relative forms) comparing it to 0. The fused handler stores the comparison result
+    as usual, then branches on it without reading the register back or dispatching a
+    second time. It counts as two steps, like any pair fused by
+    `dt31.assembler.thread`.
+
+    Args:
+        compare: The instruction at some position `ip`.
+        jump: The instruction at `ip + 1`.
+
+    Returns:
+        The fused handler for position `ip`, or None if the pair doesn't match or the
+        jump's destination isn't a literal or register (other than `ip`).
+    """
+    if type(compare) not in (LT, GT, LE, GE, EQ, NE):
+        return None
+    out = compare.out
+    if type(out) is not RegisterReference or out.register == "ip":
+        return None
+
+    jump_cls = type(jump)
+    if jump_cls in (JIF, RJIF):
+        negate = False
+    elif jump_cls in (JNE, RJNE, JEQ, RJEQ) and jump.b == Literal(0):
+        negate = jump_cls in (JEQ, RJEQ)
+    else:
+        return None
+    dest = jump.dest
+    if jump.a != out or not (
+        type(dest) is Literal
+        or (type(dest) is RegisterReference and dest.register != "ip")
+    ):
+        return None
+
+    kinds, args = _operand_layout([compare.a, compare.b, dest])
+    args.insert(2, out.register)
+    key = (_OP_EXPRESSIONS[type(compare)._op], kinds, negate, jump.is_relative)
+    factory = _BRANCH_HANDLER_FACTORIES.get(key)
+    if factory is None:
+        factory = _BRANCH_HANDLER_FACTORIES[key] = _compile_branch_handler_factory(
+            *key
+        )
+    return factory(*args)
+
+
+def _compile_branch_handler_factory(
+    expression: str, kinds: tuple[str, ...], negate: bool, relative: bool
+) -> Callable[..., Handler]:
+    """Compile a factory building compare-and-branch handlers for one layout.
+
+    The factory takes the comparison's operands, its output register name and the
+    jump's destination, each operand according to its kind.
+    """
+    atoms = _operand_atoms(["a", "b", "dest"], kinds)
+    # The jump sits at ip + 1, which relative destinations are measured from
+    target = f"ip + 1 + {atoms['dest']}" if relative else atoms["dest"]
+    source = (
+        "def factory(a, b, out, dest):\n"
+        "    def handler(cpu, ip):\n"
+        "        registers = cpu.registers\n"
+        f"        value = registers[out] = {expression.format(**atoms)}\n"
+        "        cpu.step_count += 1\n"
+        f"        if {'not ' if negate else ''}value:\n"
+        f"            return {target}\n"
+        "        return ip + 2\n"
+        "    return handler\n"
+    )
+    namespace: dict[str, Callable[..., Handler]] = {}
+    exec(compile(source, f"<dt31 branch handler: {expression}>", "exec"), namespace)
+    return namespace["factory"]
+
+
+BLOCK_SIZE = 32
+"""Maximum number of instructions `compile_block` compiles into one handler."""
+
+
+def compile_block(
+    program: list[Instruction], start: int, handlers: list[Handler]
+) -> Handler | None:
+    """Compile a run of straight-line instructions into a single handler.
+
+    Starting at `start`, takes the longest run (up to `BLOCK_SIZE`) of instructions
+    that generated source can express: built-in operations, `CP` and `PUSH` that don't
+    read or write the `ip` register. Their statements are emitted into one Python
+    function, so the whole run executes in one dispatch. If the run doesn't reach the
+    end of the program, the handler goes on to call `handlers` at the position after
+    it, like a fused pair (see `dt31.assembler.thread`).
+
+    Steps are counted as if each instruction ran on its own. If an instruction in the
+    block raises, the `ip` register and step count are left as `DT31.step` would leave
+    them: at the failing instruction, or just past it for an operation whose output
+    store fails (operations advance before storing).
+
+    Args:
+        program: An assembled program.
+        start: The position of the block's first instruction.
+        handlers: Handlers to continue with after the block, one per position.
+
+    Returns:
+        The block handler, or None if fewer than two instructions can be compiled.
+    """
+    body: list[str] = []
+    names: list[str] = []
+    args: list[object] = []
+    end = min(start + BLOCK_SIZE, len(program))
+    ip = start
+    while ip < end:
+        n = ip - start
+        statement = _statement_source(program[ip], n)
+        if statement is None:
+            break
+        lines, statement_names, statement_args = statement
+        if n:
+            body.append(f"done = {n}")
+        body += lines
+        names += statement_names
+        args += statement_args
+        ip += 1
+
+    length = ip - start
+    if length < 2:
+        return None
+    if ip < len(program):
+        names.insert(0, "tail")
+        args.insert(0, handlers[ip])
+        finish = [
+            f"cpu.step_count += {length}",
+            f"ip += {length}",
+            'registers["ip"] = ip',
+            "return tail(cpu, ip)",
+        ]
+    else:
+        finish = [f"cpu.step_count += {length - 1}", f"return ip + {length}"]
+
+    source = "\n".join(
+        [
+            f"def factory({', '.join(names)}):",
+            "    def handler(cpu, ip):",
+            "        registers = cpu.registers",
+            "        done = 0",
+            "        advanced = 0",
+            "        try:",
+            *(f"            {line}" for line in body),
+            "        except BaseException:",
+            "            cpu.step_count += done",
+            '            registers["ip"] = ip + done + advanced',
+            "            raise",
+            *(f"        {line}" for line in finish),
+            "    return handler",
+        ]
+    )
+    return _compile_block_factory(source)(*args)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_block_factory(source: str) -> Callable[..., Handler]:
+    """Compile the factory defined by block handler source.
+
+    Blocks with the same instructions and operand kinds have the same source, so only
+    their arguments differ.
+    """
+    namespace: dict[str, Callable[..., Handler]] = {}
+    exec(compile(source, "<dt31 block handler>", "exec"), namespace)
+    return namespace["factory"]
+
+
+def _statement_source(
+    inst: Instruction, n: int
+) -> tuple[list[str], list[str], list[object]] | None:
+    """Get source lines executing `inst` as the `n`th statement of a block handler.
+
+    Returns:
+        The lines, the factory parameter names they use (suffixed with `n`) and the
+        matching arguments, or None if `inst` can't be compiled into a block.
+    """
+    cls = type(inst)
+    if inst.is_blocking or cls._advance is not Instruction._advance:
+        return None
+    if isinstance(inst, (UnaryOperation, BinaryOperation)):
+        base = UnaryOperation if isinstance(inst, UnaryOperation) else BinaryOperation
+        expression = _OP_EXPRESSIONS.get(getattr(cls, "_op", None))
+        if (
+            cls.__call__ is not base.__call__
+            or cls._calc is not base._calc
+            or expression is None
+        ):
+            return None
+        operands = [inst.a] if base is UnaryOperation else [inst.a, inst.b]
+        out = inst.out
+    elif isinstance(inst, CP):
+        if cls.__call__ is not Instruction.__call__ or cls._calc is not CP._calc:
+            return None
+        expression = "{a}"
+        operands = [inst.a]
+        out = inst.b
+    elif isinstance(inst, PUSH):
+        if cls.__call__ is not Instruction.__call__ or cls._calc is not PUSH._calc:
+            return None
+        expression = "{a}"
+        operands = [inst.a]
+        out = None
+    else:
+        return None
+
+    # Block handlers only update the ip register once, at the end
+    if any(map(_references_ip, [*operands, out])):
+        return None
+
+    names = [f"a{n}", f"b{n}"][: len(operands)]
+    kinds, args = _operand_layout(operands)
+    atoms = _operand_atoms(names, kinds)
+    value = expression.format(**{name[0]: atom for name, atom in atoms.items()})
+    if out is None:
+        lines = [f"cpu.push({value})"]
+    elif isinstance(out, RegisterReference):
+        names.append(f"out{n}")
+        args.append(out.register)
+        lines = [f"registers[out{n}] = {value}"]
+    else:
+        names.append(f"out{n}")
+        args.append(
+            out.address.specialize()
+            if type(out) is MemoryReference
+            else out.resolve_address
+        )
+        lines = [f"value = {value}", f"cpu.set_memory(out{n}(cpu), value)"]
+        if isinstance(inst, (UnaryOperation, BinaryOperation)):
+            # Operations advance before storing, so a failing store leaves ip past them
+            lines[1:1] = ["advanced = 1"]
+            lines.append("advanced = 0")
+    return lines, names, args
+
+
 class JMP(ExactJumpMixin, UnconditionalJumpMixin):
     """Unconditional jump instruction."""
 
@@ -1168,6 +1908,55 @@ class RJLE(RelativeJumpMixin, IfLEJumpMixin):
 # ---------------------------------- function calls ---------------------------------- #
 
 
+def _compile_call(inst: CALL | RCALL, base: type[Jump]) -> Handler:
+    """Compile a handler pushing the return address and jumping to `inst.dest`.
+
+    Falls back to `Jump.compile_threaded` if the instruction customizes its behavior.
+    """
+    cls = type(inst)
+    dest = inst.dest
+    if (
+        cls.__call__ is not Instruction.__call__
+        or cls._advance is not Jump._advance
+        or cls._calc is not base._calc
+        or cls._jump_condition is not UnconditionalJumpMixin._jump_condition
+        or cls._jump_destination is not base._jump_destination
+        or inst.is_blocking
+        or isinstance(dest, Label)
+    ):
+        return Jump.compile_threaded(inst)
+
+    if type(dest) is Literal:
+        target = dest.value
+        if inst.is_relative:
+
+            def handler(cpu: DT31, ip: int) -> int:
+                cpu.push(ip + 1)
+                return ip + target
+
+        else:
+
+            def handler(cpu: DT31, ip: int) -> int:
+                cpu.push(ip + 1)
+                return target
+
+    else:
+        resolve_dest = dest.specialize()
+        if inst.is_relative:
+
+            def handler(cpu: DT31, ip: int) -> int:
+                cpu.push(ip + 1)
+                return ip + resolve_dest(cpu)
+
+        else:
+
+            def handler(cpu: DT31, ip: int) -> int:
+                cpu.push(ip + 1)
+                return resolve_dest(cpu)
+
+    return handler
+
+
 class CALL(ExactJumpMixin, UnconditionalJumpMixin):
     """Call function at exact destination, pushing return address to stack."""
 
@@ -1180,9 +1969,12 @@ class CALL(ExactJumpMixin, UnconditionalJumpMixin):
 
     def _calc(self, cpu: DT31) -> int:
         # Push return address (next instruction) onto stack
-        cpu.push(cpu.get_register("ip") + 1)
+        cpu.push(cpu.registers["ip"] + 1)
         return 0
 
+    def compile_threaded(self) -> Handler:
+        return _compile_call(self, CALL)
+
     def __repr__(self) -> str:
         """Return Python API representation."""
         return f"CALL(dest={self.dest!r})"
@@ -1204,9 +1996,12 @@ class RCALL(RelativeJumpMixin, UnconditionalJumpMixin):
 
     def _calc(self, cpu: DT31) -> int:
         # Push return address (next instruction) onto stack
-        cpu.push(cpu.get_register("ip") + 1)
+        cpu.push(cpu.registers["ip"] + 1)
         return 0
 
+    def compile_threaded(self) -> Handler:
+        return _compile_call(self, RCALL)
+
     def __repr__(self) -> str:
         """Return Python API representation."""
         return f"RCALL(dest={self.dest!r})"
@@ -1227,8 +2022,22 @@ class RET(Instruction):
 
     def _advance(self, cpu: DT31):
         # Pop return address from stack and set IP to it
-        return_address = cpu.pop()
-        cpu.set_register("ip", return_address)
+        cpu.registers["ip"] = cpu.pop()
+
+    def compile_threaded(self) -> Handler:
+        cls = type(self)
+        if (
+            cls.__call__ is not Instruction.__call__
+            or cls._advance is not RET._advance
+            or cls._calc is not RET._calc
+            or self.is_blocking
+        ):
+            return super().compile_threaded()
+
+        def handler(cpu: DT31, ip: int) -> int:
+            return cpu.pop()
+
+        return handler
 
     def __repr__(self) -> str:
         """Return Python API representation."""
@@ -1245,6 +2054,8 @@ class RET(Instruction):
 class PUSH(Instruction):
     """Push operand value onto the stack."""
 
+    OPERAND_ATTRS = ("a",)
+
     def __init__(self, a: Operand | int):
         """
         Args:
@@ -1257,6 +2068,40 @@ class PUSH(Instruction):
         cpu.push(self.a.resolve(cpu))
         return 0
 
+    def compile_threaded(self) -> Handler:
+        cls = type(self)
+        if (
+            cls.__call__ is not Instruction.__call__
+            or cls._advance is not Instruction._advance
+            or cls._calc is not PUSH._calc
+            or self.is_blocking
+        ):
+            return super().compile_threaded()
+
+        a = self.a
+        if type(a) is Literal:
+            value = a.value
+
+            def handler(cpu: DT31, ip: int) -> int:
+                cpu.push(value)
+                return ip + 1
+
+        elif type(a) is RegisterReference:
+            register = a.register
+
+            def handler(cpu: DT31, ip: int) -> int:
+                cpu.push(cpu.registers[register])
+                return ip + 1
+
+        else:
+            resolve_a = a.specialize()
+
+            def handler(cpu: DT31, ip: int) -> int:
+                cpu.push(resolve_a(cpu))
+                return ip + 1
+
+        return sequential(handler)
+
     def __repr__(self) -> str:
         """Return Python API representation."""
         return f"PUSH(a={self.a!r})"
@@ -1269,6 +2114,8 @@ class PUSH(Instruction):
 class POP(Instruction):
     """Pop value from the stack."""
 
+    OPERAND_ATTRS = ("out",)
+
     def __init__(self, out: Reference | None = None):
         """
         Args:
@@ -1282,11 +2129,50 @@ class POP(Instruction):
             self.out = None
 
     def _calc(self, cpu: DT31) -> int:
-        value = as_op(cpu.pop()).resolve(cpu)
+        value = cpu.pop()
         if self.out is not None:
             cpu[self.out] = value
         return 0
 
+    def compile_threaded(self) -> Handler:
+        cls = type(self)
+        out = self.out
+        if (
+            cls.__call__ is not Instruction.__call__
+            or cls._advance is not Instruction._advance
+            or cls._calc is not POP._calc
+            or self.is_blocking
+            or (isinstance(out, RegisterReference) and out.register == "ip")
+        ):
+            return super().compile_threaded()
+
+        if out is None:
+
+            def handler(cpu: DT31, ip: int) -> int:
+                cpu.pop()
+                return ip + 1
+
+        elif type(out) is RegisterReference:
+            register = out.register
+
+            def handler(cpu: DT31, ip: int) -> int:
+                cpu.registers[register] = cpu.pop()
+                return ip + 1
+
+        else:
+            resolve_address = (
+                out.address.specialize()
+                if type(out) is MemoryReference
+                else out.resolve_address
+            )
+
+            def handler(cpu: DT31, ip: int) -> int:
+                value = cpu.pop()
+                cpu.set_memory(resolve_address(cpu), value)
+                return ip + 1
+
+        return sequential(handler)
+
     def __repr__(self) -> str:
         """Return Python API representation."""
         return f"POP(out={self.out!r})"
@@ -1301,6 +2187,8 @@ class POP(Instruction):
 class SEMP(Instruction):
     """Check if stack is empty and store result."""
 
+    OPERAND_ATTRS = ("out",)
+
     def __init__(self, out: Reference):
         """
         Args:
@@ -1317,6 +2205,27 @@ class SEMP(Instruction):
         cpu[self.out] = value
         return value
 
+    def compile_threaded(self) -> Handler:
+        cls = type(self)
+        out = self.out
+        if (
+            cls.__call__ is not Instruction.__call__
+            or cls._advance is not Instruction._advance
+            or cls._calc is not SEMP._calc
+            or self.is_blocking
+            or type(out) is not RegisterReference
+            or out.register == "ip"
+        ):
+            return super().compile_threaded()
+
+        register = out.register
+
+        def handler(cpu: DT31, ip: int) -> int:
+            cpu.registers[register] = 0 if cpu.stack else 1
+            return ip + 1
+
+        return sequential(handler)
+
     def __repr__(self) -> str:
         """Return Python API representation."""
         return f"SEMP(out={self.out!r})"
@@ -1329,9 +2238,77 @@ class SEMP(Instruction):
 # ---------------------------------------- I/O --------------------------------------- #
 
 
+def _compile_output(
+    inst: NOUT | COUT, base: type[Instruction], as_char: bool
+) -> Handler:
+    """Compile a handler printing `inst.a`.
+
+    A literal newline flag (the usual case) is turned into the `end` string up front,
+    and register operands are read from the register dict directly; other operands go
+    through their specialized resolver. A non-literal newline flag is resolved on each
+    execution, before `inst.a` as in `_calc`. Like `_calc`, handlers write the text and
+    `end` to `sys.stdout` in one call, which is much cheaper than `print`.
+
+    Falls back to the generic handler if the instruction customizes its behavior.
+    """
+    cls = type(inst)
+    if (
+        cls.__call__ is not Instruction.__call__
+        or cls._advance is not Instruction._advance
+        or cls._calc is not base._calc
+        or inst.is_blocking
+    ):
+        return Instruction.compile_threaded(inst)
+
+    if type(inst.b) is not Literal:
+        resolve_a = inst.a.specialize()
+        resolve_b = inst.b.specialize()
+
+        def handler(cpu: DT31, ip: int) -> int:
+            end = "\n" if resolve_b(cpu) != 0 else ""
+            value = resolve_a(cpu)
+            sys.stdout.write(f"{chr(value) if as_char else value}{end}")
+            return ip + 1
+
+        return sequential(handler)
+
+    end = "\n" if inst.b.value != 0 else ""
+    if type(inst.a) is RegisterReference:
+        register = inst.a.register
+        if as_char:
+
+            def handler(cpu: DT31, ip: int) -> int:
+                sys.stdout.write(chr(cpu.registers[register]) + end)
+                return ip + 1
+
+        else:
+
+            def handler(cpu: DT31, ip: int) -> int:
+                sys.stdout.write(f"{cpu.registers[register]}{end}")
+                return ip + 1
+
+    else:
+        resolve_a = inst.a.specialize()
+        if as_char:
+
+            def handler(cpu: DT31, ip: int) -> int:
+                sys.stdout.write(chr(resolve_a(cpu)) + end)
+                return ip + 1
+
+        else:
+
+            def handler(cpu: DT31, ip: int) -> int:
+                sys.stdout.write(f"{resolve_a(cpu)}{end}")
+                return ip + 1
+
+    return sequential(handler)
+
+
 class CP(Instruction):
     """Copy operand value to output reference."""
 
+    OPERAND_ATTRS = ("a", "b")
+
     def __init__(self, a: Operand | int, b: Reference):
         """
         Args:
@@ -1349,6 +2326,58 @@ class CP(Instruction):
         cpu[self.b] = value
         return value
 
+    def compile_threaded(self) -> Handler:
+        cls = type(self)
+        b = self.b
+        if (
+            cls.__call__ is not Instruction.__call__
+            or cls._advance is not Instruction._advance
+            or cls._calc is not CP._calc
+            or self.is_blocking
+            or (isinstance(b, RegisterReference) and b.register == "ip")
+        ):
+            return super().compile_threaded()
+
+        a = self.a
+        if type(b) is RegisterReference:
+            rb = b.register
+            if type(a) is Literal:
+                value = a.value
+
+                def handler(cpu: DT31, ip: int) -> int:
+                    cpu.registers[rb] = value
+                    return ip + 1
+
+            elif type(a) is RegisterReference:
+                ra = a.register
+
+                def handler(cpu: DT31, ip: int) -> int:
+                    registers = cpu.registers
+                    registers[rb] = registers[ra]
+                    return ip + 1
+
+            else:
+                resolve_a = a.specialize()
+
+                def handler(cpu: DT31, ip: int) -> int:
+                    cpu.registers[rb] = resolve_a(cpu)
+                    return ip + 1
+
+        else:
+            resolve_a = a.specialize()
+            resolve_address = (
+                b.address.specialize()
+                if type(b) is MemoryReference
+                else b.resolve_address
+            )
+
+            def handler(cpu: DT31, ip: int) -> int:
+                value = resolve_a(cpu)
+                cpu.set_memory(resolve_address(cpu), value)
+                return ip + 1
+
+        return sequential(handler)
+
     def __repr__(self) -> str:
         """Return Python API representation."""
         return f"{self.name}(a={self.a!r}, b={self.b!r})"
@@ -1361,6 +2390,8 @@ class CP(Instruction):
 class NOUT(Instruction):
     """Output operand as a number."""
 
+    OPERAND_ATTRS = ("a", "b")
+
     def __init__(self, a: Operand, b: Operand | int = L[0]):
         """
         Args:
@@ -1375,9 +2406,12 @@ class NOUT(Instruction):
         end = ""
         if self.b.resolve(cpu) != 0:
             end = "\n"
-        print(self.a.resolve(cpu), end=end)
+        sys.stdout.write(f"{self.a.resolve(cpu)}{end}")
         return 0
 
+    def compile_threaded(self) -> Handler:
+        return _compile_output(self, NOUT, as_char=False)
+
     def __repr__(self) -> str:
         """Return Python API representation."""
         return f"NOUT(a={self.a!r}, b={self.b!r})"
@@ -1402,6 +2436,8 @@ class NOUT(Instruction):
 class COUT(Instruction):
     """Output operand as a character (using chr())."""
 
+    OPERAND_ATTRS = ("a", "b")
+
     def __init__(self, a: Operand, b: Operand | int = L[0]):
         """
         Args:
@@ -1416,9 +2452,12 @@ class COUT(Instruction):
         end = ""
         if self.b.resolve(cpu) != 0:
             end = "\n"
-        print(chr(self.a.resolve(cpu)), end=end)
+        sys.stdout.write(chr(self.a.resolve(cpu)) + end)
         return 0
 
+    def compile_threaded(self) -> Handler:
+        return _compile_output(self, COUT, as_char=True)
+
     def __repr__(self) -> str:
         """Return Python API representation."""
         return f"COUT(a={self.a!r}, b={self.b!r})"
@@ -1443,6 +2482,8 @@ class COUT(Instruction):
 class NIN(Instruction):
     """Read number input from user."""
 
+    OPERAND_ATTRS = ("out",)
+
     def __init__(self, out: Reference):
         """
         Args:
@@ -1470,6 +2511,8 @@ class NIN(Instruction):
 class CIN(Instruction):
     """Read character input from user and store as ordinal value."""
 
+    OPERAND_ATTRS = ("out",)
+
     def __init__(self, out: Reference):
         """
         Args:
@@ -1502,6 +2545,8 @@ class CIN(Instruction):
 class STRIN(Instruction):
     """Read in a string to memory, terminating with a 0."""
 
+    OPERAND_ATTRS = ("out",)
+
     def __init__(self, out: MemoryReference):
         """
         Args:
@@ -1548,6 +2593,8 @@ class STRIN(Instruction):
 class STROUT(Instruction):
     """Print a string from memory until 0 is reached."""
 
+    OPERAND_ATTRS = ("a", "b")
+
     def __init__(self, a: MemoryReference, b: Operand | int = L[0]):
         """
         Args:
@@ -1574,7 +2621,7 @@ class STROUT(Instruction):
         end = ""
         if self.b.resolve(cpu) != 0:
             end = "\n"
-        print("".join(output), end=end)
+        sys.stdout.write("".join(output) + end)
         return 0
 
     def __repr__(self) -> str:
@@ -1606,6 +2653,8 @@ class NEXT(Instruction):
     index of the first zero found, or -1 if no zero exists.
     """
 
+    OPERAND_ATTRS = ("a", "out")
+
     def __init__(self, a: Operand | int, out: Reference):
         """
         Args:
@@ -1680,6 +2729,8 @@ class BRKD(Instruction):
 class EXIT(Instruction):
     """Exit the program with a status code."""
 
+    OPERAND_ATTRS = ("status_code",)
+
     def __init__(self, status_code: Operand | int = L[0]):
         """
         Args:
@@ -1,18 +1,49 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from functools import cache
+from typing import TYPE_CHECKING, Callable
 
 if TYPE_CHECKING:
     from dt31.cpu import DT31  # pragma: no cover
 
+# Integer tags identifying the kind of an operand (see `Operand.KIND`)
+KIND_LITERAL = 0
+KIND_REGISTER = 1
+KIND_MEMORY = 2
+KIND_LABEL = 3
+
+_UNSET = object()
+
+
+@cache
+def _slot_names(cls: type) -> tuple[str, ...]:
+    """Get the names of the slots declared by a class and all of its bases."""
+    names: list[str] = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    return tuple(name for name in names if name not in ("__dict__", "__weakref__"))
+
 
 class Operand:
     """Base class for operands in DT31 assembly instructions.
 
     Operands can be literals, register references, or memory references.
     All operands must implement the resolve method to return their value.
+
+    Operands declare `__slots__`, which keeps them small and makes attribute access fast
+    since they're read on every executed instruction. Equality compares the values of
+    all slots, including inherited ones, and the instance dict of subclasses without
+    `__slots__`.
     """
 
+    __slots__ = ()
+
+    KIND: int | None = None
+    """Integer tag for the kind of operand (`KIND_LITERAL`, `KIND_REGISTER`, ...).
+
+    Lets hot code dispatch on the kind of an operand with an integer comparison."""
+
     def resolve(self, cpu: DT31) -> int:
         """Resolve the operand to its integer value.
 
@@ -27,10 +58,26 @@ class Operand:
         """
         raise NotImplementedError()
 
+    def specialize(self) -> Callable[[DT31], int]:
+        """Get a function equivalent to `resolve`, specialized for this operand.
+
+        The specialized function skips the generic method dispatch of `resolve`, which
+        matters for operands read on every executed instruction. It may assume the
+        program's registers have been validated against the CPU (see
+        `DT31.validate_program_registers`).
+
+        Returns:
+            A function taking the CPU and returning the operand's value.
+        """
+        return self.resolve
+
     def __eq__(self, other):
         if type(self) is not type(other):
             return False
-        return self.__dict__ == other.__dict__
+        return all(
+            getattr(self, name, _UNSET) == getattr(other, name, _UNSET)
+            for name in _slot_names(type(self))
+        ) and getattr(self, "__dict__", None) == getattr(other, "__dict__", None)
 
 
 class Literal(Operand):
@@ -39,6 +86,9 @@ class Literal(Operand):
     Literal operands resolve to their constant value regardless of CPU state.
     """
 
+    __slots__ = ("value", "is_char")
+    KIND = KIND_LITERAL
+
     def __init__(self, value: int, is_char: bool = False):
         """Initialize a literal operand.
 
@@ -60,6 +110,12 @@ class Literal(Operand):
         """
         return self.value
 
+    def specialize(self) -> Callable[[DT31], int]:
+        if type(self).resolve is not Literal.resolve:
+            return self.resolve
+        value = self.value
+        return lambda cpu: value
+
     def __repr__(self) -> str:
         """Return Python API representation."""
         return str(self.value)
@@ -86,6 +142,34 @@ class Literal(Operand):
             return other.value == self.value
         return False
 
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+
+_LITERAL_CACHE_MIN = -256
+_LITERAL_CACHE_MAX = 256
+_LITERAL_CACHE = [
+    Literal(i) for i in range(_LITERAL_CACHE_MIN, _LITERAL_CACHE_MAX + 1)
+]
+"""Shared instances of small non-character literals, like CPython's small-int cache."""
+
+
+def intern_literal(value: int) -> Literal:
+    """Get a Literal for a value, reusing a shared instance for small values.
+
+    Literals are treated as immutable, so small ones (-256 through 256) are shared instead
+    of allocated anew.
+
+    Args:
+        value: The literal's integer value.
+
+    Returns:
+        A non-character Literal with the given value.
+    """
+    if _LITERAL_CACHE_MIN <= value <= _LITERAL_CACHE_MAX:
+        return _LITERAL_CACHE[value - _LITERAL_CACHE_MIN]
+    return Literal(value)
+
 
 class _MetaLiteral(type):
     """Metaclass enabling bracket syntax for creating Literal operands."""
@@ -99,7 +183,7 @@ class _MetaLiteral(type):
         Returns:
             A Literal operand with the specified value.
         """
-        return Literal(arg)
+        return intern_literal(arg)
 
 
 class L(metaclass=_MetaLiteral):
@@ -151,6 +235,9 @@ class MemoryReference(Operand):
     The address itself can be a constant or another operand (indirect addressing).
     """
 
+    __slots__ = ("address",)
+    KIND = KIND_MEMORY
+
     def __init__(self, address: int | Operand):
         """Initialize a memory reference operand.
 
@@ -171,6 +258,19 @@ class MemoryReference(Operand):
         """
         return cpu.get_memory(self.resolve_address(cpu))
 
+    def specialize(self) -> Callable[[DT31], int]:
+        cls = type(self)
+        if (
+            cls.resolve is not MemoryReference.resolve
+            or cls.resolve_address is not MemoryReference.resolve_address
+        ):
+            return self.resolve
+        if type(self.address) is Literal:
+            address = self.address.value
+            return lambda cpu: cpu.get_memory(address)
+        read_address = self.address.specialize()
+        return lambda cpu: cpu.get_memory(read_address(cpu))
+
     def resolve_address(self, cpu: DT31) -> int:
         """Resolve the address of this memory reference.
 
@@ -263,6 +363,9 @@ class RegisterReference(Operand):
     for dunder methods).
     """
 
+    __slots__ = ("register",)
+    KIND = KIND_REGISTER
+
     def __init__(self, register: str):
         """Initialize a register reference operand.
 
@@ -285,8 +388,20 @@ class RegisterReference(Operand):
 
         Returns:
             The value currently stored in the referenced register.
+
+        Raises:
+            ValueError: If the CPU has no register with this name.
         """
-        return cpu.get_register(self.register)
+        try:
+            return cpu.registers[self.register]
+        except KeyError:
+            raise ValueError(f"unknown register {self.register}") from None
+
+    def specialize(self) -> Callable[[DT31], int]:
+        if type(self).resolve is not RegisterReference.resolve:
+            return self.resolve
+        register = self.register
+        return lambda cpu: cpu.registers[register]
 
     def __repr__(self) -> str:
         """Return Python API representation."""
@@ -359,7 +474,7 @@ def as_op(arg: int | Operand):
     if isinstance(arg, Operand):
         return arg
     elif isinstance(arg, int):
-        return Literal(arg)
+        return intern_literal(arg)
     else:
         raise ValueError(f"can't coerce value {arg} into operand")
 
@@ -443,6 +558,9 @@ class Label:
     ```
     """
 
+    __slots__ = ("name", "comment")
+    KIND = KIND_LABEL
+
     def __init__(self, name: str):
         """Initialize a label with a given name.
 
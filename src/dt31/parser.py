@@ -8,8 +8,10 @@ from dt31.operands import (
     L,
     Label,
     M,
+    MemoryReference,
     Operand,
     R,
+    RegisterReference,
 )
 
 
@@ -122,6 +124,7 @@ def parse_program(
     text: str,
     custom_instructions: dict[str, type[Instruction]] | None = None,
     preserve_newlines: bool = False,
+    registers: set[str] | None = None,
 ) -> list[Instruction | Label | Comment | BlankLine]:
     """
     Parse DT31 assembly text into a program list.
@@ -135,6 +138,10 @@ def parse_program(
         custom_instructions: Optional dict of custom instruction names to `Instruction`
             subclasses
         preserve_newlines: If True, preserve blank lines as BlankLine objects (default: False)
+        registers: Optional set to which the names of registers used as operands (other
+            than `R.ip`) are added while parsing. This saves a separate pass with
+            `dt31.assembler.extract_registers_from_program`, as long as no custom
+            instruction adds register operands of its own.
 
     Returns:
         List of Instructions, Labels, Comments, and optionally BlankLines ready for cpu.run()
@@ -230,6 +237,9 @@ def parse_program(
         except ParserError as e:
             raise ParserError(f"Line {line_num}: {e}") from e
 
+        if registers is not None:
+            _collect_registers(operands, registers)
+
         # Get instruction function
         try:
             if inst_name in custom_instructions:
@@ -257,6 +267,15 @@ def parse_program(
     return program
 
 
+def _collect_registers(operands: list[Operand | Label], registers: set[str]) -> None:
+    """Add the names of registers in `operands`, including inside memory references."""
+    for operand in operands:
+        while isinstance(operand, MemoryReference):
+            operand = operand.address
+        if isinstance(operand, RegisterReference) and operand.register != "ip":
+            registers.add(operand.register)
+
+
 def parse_operand(token: str) -> Operand | Label:
     """
     Parse a single operand token into an Operand object.
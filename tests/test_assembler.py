@@ -1,3 +1,6 @@
+import contextlib
+import io
+
 import pytest
 
 from dt31 import instructions as I
@@ -5,7 +8,9 @@ from dt31.assembler import (
     AssemblyError,
     assemble,
     extract_registers_from_program,
+    thread,
 )
+from dt31.cpu import DT31
 from dt31.operands import L, Label, Literal, M, R
 
 # ============================================================================
@@ -468,6 +473,76 @@ def test_modifying_result_does_not_affect_original():
     assert repr(program[0]) == "CP(a=0, b=R.a)"
 
 
+def test_assembled_instructions_are_distinct_objects():
+    """Assembled instructions should be copies, even without labels."""
+    program = [I.CP(L[0], R.a), I.JMP(L[0])]
+    result = assemble(program)
+    assert result == program
+    assert all(new is not old for new, old in zip(result, program))
+
+
+def test_custom_jump_subclass_label_resolved():
+    """Jump subclasses defined outside dt31 are registered for label resolution."""
+
+    class RJALWAYS(I.RelativeJumpMixin, I.UnconditionalJumpMixin):
+        def __init__(self, dest):
+            super().__init__("RJALWAYS", dest)
+
+    assert RJALWAYS in I.JUMP_CLASSES
+    result = assemble([Label("top"), I.NOOP(), RJALWAYS(Label("top"))])
+    assert result[1].dest == Literal(-1)
+
+
+def test_multiple_forward_references_resolved_when_label_reached():
+    """Several pending forward references to one label are all patched."""
+    program = [
+        I.JMP(Label("end")),
+        I.RJMP(Label("end")),
+        I.NOOP(),
+        Label("end"),
+        I.RJMP(Label("end")),
+    ]
+    result = assemble(program)
+    assert result[0].dest == Literal(3)
+    assert result[1].dest == Literal(2)
+    assert result[3].dest == Literal(0)
+
+
+def test_first_undefined_label_reported():
+    """The first undefined label in program order is reported."""
+    program = [I.JMP(Label("missing1")), I.JMP(Label("missing2"))]
+    with pytest.raises(AssemblyError, match="Undefined label: missing1"):
+        assemble(program)
+
+
+# ============================================================================
+# Reassembly
+# ============================================================================
+
+
+def test_assemble_returns_independent_instructions():
+    """Re-assembling a program returns equal but independent instructions."""
+    program = [I.JMP(Label("end")), Label("end"), I.NOOP()]
+    first = assemble(program)
+    first[0].dest = L[0]
+    first.append(I.NOOP())
+    second = assemble(program)
+    assert second == [I.JMP(L[1]), I.NOOP()]
+    assert all(a is not b for a, b in zip(first, second))
+
+
+def test_assemble_reflects_changes_to_program():
+    """Replacing items or mutating instructions in place is seen by later assemblies."""
+    program = [I.CP(L[1], R.a)]
+    assemble(program)
+    program[0] = I.CP(L[2], R.a)
+    assert assemble(program) == [I.CP(L[2], R.a)]
+    program[0].a = L[3]
+    assert assemble(program) == [I.CP(L[3], R.a)]
+    program.append(I.NOOP())
+    assert assemble(program) == [I.CP(L[3], R.a), I.NOOP()]
+
+
 # ============================================================================
 # Edge Cases
 # ============================================================================
@@ -607,3 +682,566 @@ def test_extract_registers_sorted():
     ]
     registers = extract_registers_from_program(program)
     assert registers == ["a", "m", "z"]
+
+
+# ============================================================================
+# Threaded Code
+# ============================================================================
+
+
+def test_thread_one_handler_per_instruction():
+    """Threading produces one callable handler per instruction."""
+    program = assemble([I.CP(1, R.a), Label("x"), I.JMP(Label("x"))])
+    handlers = thread(program)
+    assert len(handlers) == len(program)
+    assert all(callable(h) for h in handlers)
+
+
+def test_thread_handlers_match_instruction_semantics():
+    """Handlers perform the instruction and return the next instruction pointer."""
+    cpu = DT31()
+    cpu.registers["a"] = 5
+    add, store, jump, skip = (
+        inst.compile_threaded()
+        for inst in [
+            I.ADD(R.a, 2),
+            I.ADD(R.a, 0, M[R.a]),
+            I.JGT(L[9], R.a, 0),
+            I.JGT(L[9], R.b, 0),
+        ]
+    )
+    assert add(cpu, 0) == 1
+    assert cpu.registers["a"] == 7
+    assert store(cpu, 1) == 2
+    assert cpu.memory[7] == 7
+    assert jump(cpu, 2) == 9
+    assert skip(cpu, 3) == 4
+
+
+@pytest.mark.parametrize(
+    "inst, expected",
+    [
+        (I.SUB(R.a, R.b, R.c), 3),
+        (I.SUB(R.a, L[2], R.c), 5),
+        (I.SUB(L[2], R.a, R.c), -5),
+        (I.SUB(L[9], L[2], R.c), 7),
+        (I.SUB(M[R.b], R.a, R.c), -7),
+        (I.NOT(R.b, R.c), 0),
+        (I.NOT(L[0], R.c), 1),
+        (I.MUL(L[6], L[7], R.c), 42),
+        (I.BNOT(M[4], R.c), -1),
+    ],
+)
+def test_thread_operand_kinds(inst, expected):
+    """Handlers specialized by operand kind compute the same result as `_calc`."""
+    cpu = DT31()
+    cpu.registers["a"] = 7
+    cpu.registers["b"] = 4
+    (handler,) = thread([inst])
+    assert handler(cpu, 0) == 1
+    assert cpu.registers["c"] == expected == inst._calc(cpu)
+
+
+@pytest.mark.parametrize(
+    "cls",
+    [I.ADD, I.SUB, I.MUL, I.DIV, I.MOD, I.BSL, I.BSR, I.BAND, I.BOR, I.BXOR]
+    + [I.LT, I.GT, I.LE, I.GE, I.EQ, I.NE, I.XOR],
+)
+def test_thread_generated_binary_handlers_match_op(cls):
+    """Generated handlers compute the same values as `_op` for every operand kind."""
+    for a, b in [(7, 3), (-7, 3), (3, 3), (0, 5)]:
+        for inst in [
+            cls(R.a, R.b, R.c),
+            cls(R.a, L[b], R.c),
+            cls(L[a], R.b, R.c),
+            cls(R.a, M[1], M[R.d]),
+        ]:
+            cpu = DT31(registers=["a", "b", "c", "d"])
+            cpu.registers.update(a=a, b=b, d=5)
+            cpu.memory[1] = b
+            (handler,) = thread([inst])
+            assert handler(cpu, 0) == 1
+            assert cpu[inst.out] == cls._op(a, b)
+
+
+@pytest.mark.parametrize("cls", [I.BNOT, I.NOT])
+def test_thread_generated_unary_handlers_match_op(cls):
+    """Generated unary handlers compute the same values as `_op`."""
+    for a in [-2, 0, 3]:
+        cpu = DT31()
+        cpu.registers["a"] = a
+        (handler,) = thread([cls(R.a, R.b)])
+        assert handler(cpu, 0) == 1
+        assert cpu.registers["b"] == cls._op(a)
+
+
+def test_thread_overridden_op_is_respected():
+    """Subclasses replacing `_op` don't get the parent's generated expression."""
+
+    class RSUB(I.SUB):
+        @staticmethod
+        def _op(a, b):
+            return b - a
+
+    cpu = DT31()
+    cpu.registers["a"] = 10
+    (handler,) = thread([RSUB(R.a, L[3])])
+    handler(cpu, 0)
+    assert cpu.registers["a"] == -7
+
+
+class _RSUB(I.SUB):
+    @staticmethod
+    def _op(a, b):
+        return b - a
+
+
+class _HALF(I.UnaryOperation):
+    def __init__(self, a, out=None):
+        super().__init__("HALF", a, out)
+
+    @staticmethod
+    def _op(a):
+        return a // 2
+
+
+class _SUM(I.BinaryOperation):
+    def __init__(self, a, b, out=None):
+        super().__init__("SUM", a, b, out)
+
+    def _calc(self, cpu):
+        return self.a.resolve(cpu) + self.b.resolve(cpu) + cpu.registers["d"]
+
+
+class _SEVEN(I.NullaryOperation):
+    def __init__(self, out):
+        super().__init__("SEVEN", out)
+
+    def _calc(self, cpu):
+        return 7
+
+
+@pytest.mark.parametrize(
+    "inst",
+    [
+        I.ADD(R.a, R.b, R.c),
+        I.SUB(L[2], M[R.b], M[3]),
+        I.MUL(L[6], L[7], R.c),
+        I.DIV(L[6], L[0], R.c),
+        I.MOD(R.a, L[0], R.c),
+        I.BNOT(M[4], R.c),
+        I.NOT(L[0], M[R.a]),
+        I.LT(R.a, L[9], R.d),
+        I.ADD(R.a, L[1], M[R.d]),
+        _RSUB(R.a, L[3], R.c),
+        _RSUB(L[1], L[3], M[2]),
+        _HALF(R.a, R.b),
+        _HALF(L[9], M[R.d]),
+        _SUM(R.a, L[1], R.c),
+        _SEVEN(M[R.a]),
+        _SEVEN(M[R.d]),
+    ],
+)
+def test_thread_operation_handler_matches_call(inst):
+    """Generated operation handlers leave the same state as calling the instruction."""
+    cpus = []
+    for handler in [inst.compile_threaded(), I.Instruction.compile_threaded(inst)]:
+        cpu = DT31(memory_size=16, registers=["a", "b", "c", "d"])
+        cpu.registers.update(a=7, b=4, d=40, ip=5)
+        cpu.memory[4] = 3
+        try:
+            # Store the next ip as the run loop does
+            result = cpu.registers["ip"] = handler(cpu, 5)
+        except (ArithmeticError, IndexError) as e:
+            result = type(e)
+        cpus.append((result, cpu.registers, cpu.memory))
+    assert cpus[0] == cpus[1]
+
+
+@pytest.mark.parametrize(
+    "cls",
+    [I.JEQ, I.JNE, I.JGT, I.JGE, I.JLT, I.JLE]
+    + [I.RJEQ, I.RJNE, I.RJGT, I.RJGE, I.RJLT, I.RJLE],
+)
+def test_thread_generated_binary_jumps_match_methods(cls):
+    """Generated jump handlers branch like `_jump_condition`/`_jump_destination`."""
+    for a, b in [(7, 3), (3, 7), (3, 3)]:
+        for inst in [
+            cls(L[2], R.a, R.b),
+            cls(R.d, R.a, L[b]),
+            cls(M[0], L[a], M[1]),
+        ]:
+            cpu = DT31(registers=["a", "b", "d"])
+            cpu.registers.update(ip=3, a=a, b=b, d=-1)
+            cpu.memory[0] = 4
+            cpu.memory[1] = b
+            (handler,) = thread([inst])
+            next_ip = handler(cpu, 3)
+            inst(cpu)
+            assert next_ip == cpu.registers["ip"]
+
+
+@pytest.mark.parametrize("cls", [I.JMP, I.RJMP, I.JIF, I.RJIF])
+def test_thread_generated_jumps_match_methods(cls):
+    """Generated unconditional and truthiness jumps match the generic path."""
+    for a in [-2, 0, 3]:
+        for dest in [L[1], R.d, M[R.d]]:
+            inst = cls(dest, R.a) if cls in (I.JIF, I.RJIF) else cls(dest)
+            cpu = DT31(registers=["a", "d"])
+            cpu.registers.update(ip=3, a=a, d=2)
+            cpu.memory[2] = 5
+            (handler,) = thread([inst])
+            next_ip = handler(cpu, 3)
+            inst(cpu)
+            assert next_ip == cpu.registers["ip"]
+
+
+def _run_and_step(program: list, **registers: int) -> list[tuple]:
+    """Execute a program with `run` and with repeated `step`, returning both end states.
+
+    Each state holds the error raised (if any), the output, registers, memory, stack and
+    step count.
+    """
+    states = []
+    for stepping in (False, True):
+        cpu = DT31(memory_size=16, registers=["a", "b", "c", "d", "t"])
+        cpu.registers.update(registers)
+        output = io.StringIO()
+        error = None
+        try:
+            with contextlib.redirect_stdout(output):
+                if stepping:
+                    cpu.load(program)
+                    while 0 <= cpu.registers["ip"] < len(cpu.instructions):
+                        cpu.step()
+                else:
+                    cpu.run(program)
+        except Exception as e:
+            error = type(e)
+        states.append(
+            (
+                error,
+                output.getvalue(),
+                cpu.registers,
+                cpu.memory,
+                list(cpu.stack),
+                cpu.step_count,
+            )
+        )
+    return states
+
+
+@pytest.mark.parametrize("cmp", [I.LT, I.GT, I.LE, I.GE, I.EQ, I.NE])
+@pytest.mark.parametrize(
+    "make_jump",
+    [
+        lambda: I.JIF(L[9], R.t),
+        lambda: I.RJIF(R.d, R.t),
+        lambda: I.JEQ(R.d, R.t, L[0]),
+        lambda: I.RJNE(L[2], R.t, L[0]),
+    ],
+)
+def test_thread_fuses_compare_branch(cmp, make_jump):
+    """Compare-and-branch handlers match running both instructions in turn."""
+    for a, b in [(7, 3), (3, 7), (3, 3)]:
+        program = [cmp(R.a, L[b], R.t), make_jump()]
+        handlers = thread(program)
+
+        fused = DT31(registers=["a", "d", "t"])
+        fused.registers.update(a=a, d=5)
+        ip = handlers[0](fused, 0)
+
+        expected = DT31(registers=["a", "d", "t"])
+        expected.registers.update(a=a, d=5)
+        for inst in program:
+            inst(expected)
+        assert ip == expected.registers["ip"]
+        assert fused.registers["t"] == expected.registers["t"]
+        assert fused.step_count == 1
+
+        ran, stepped = _run_and_step(program + [I.NOUT(R.t)], a=a, d=5)
+        assert ran == stepped
+
+
+def test_thread_fuses_into_compare_branch():
+    """The instruction before a compare-and-branch runs all three in one dispatch."""
+    program = [I.ADD(R.a, L[1]), I.LT(R.a, L[3], R.t), I.JIF(L[0], R.t)]
+    cpu = DT31(registers=["a", "t"])
+    handlers = thread(program)
+    assert handlers[0](cpu, 0) == 0
+    assert cpu.step_count == 2
+    assert cpu.registers["a"] == 1
+    assert cpu.registers["t"] == 1
+
+    cpu = DT31(registers=["a", "t"])
+    cpu.run(program)
+    assert cpu.registers["a"] == 3
+    assert cpu.step_count == 9
+
+
+def test_thread_compare_branch_requires_matching_register():
+    """Branches on a different register than the comparison's output aren't fused."""
+    program = [I.LT(R.a, R.b, R.c), I.JIF(L[3], R.a), I.NOUT(R.c), I.NOUT(R.a)]
+    for a in [0, 1]:
+        ran, stepped = _run_and_step(program, a=a, b=1)
+        assert ran == stepped
+        assert ran[1] == ("1" if a else "10")
+
+
+def test_thread_overridden_jump_condition_is_respected():
+    """Subclasses replacing `_jump_condition` don't get a generated condition."""
+
+    class JODD(I.JIF):
+        def _jump_condition(self, cpu):
+            return self.a.resolve(cpu) % 2 == 1
+
+    cpu = DT31()
+    cpu.registers["a"] = 2
+    (handler,) = thread([JODD(L[7], R.a)])
+    assert handler(cpu, 0) == 1
+
+
+@pytest.mark.parametrize(
+    "inst, location, expected",
+    [
+        (I.CP(L[5], R.c), R.c, 5),
+        (I.CP(R.a, R.c), R.c, 7),
+        (I.CP(M[R.b], R.c), R.c, 0),
+        (I.CP(R.a, M[R.b]), M[4], 7),
+    ],
+)
+def test_thread_cp(inst, location, expected):
+    """CP handlers copy values between operands of every kind."""
+    cpu = DT31()
+    cpu.registers["a"] = 7
+    cpu.registers["b"] = 4
+    (handler,) = thread([inst])
+    assert handler(cpu, 0) == 1
+    assert cpu[location] == expected
+
+
+def test_thread_noop():
+    """NOOP handlers only advance, and fuse with the next instruction."""
+    cpu = DT31()
+    handlers = thread([I.NOOP(), I.ADD(R.a, L[1])])
+    assert handlers[0](cpu, 0) == 2
+    assert cpu.registers["a"] == 1
+    assert cpu.step_count == 1
+
+
+def test_thread_call_ret():
+    """CALL pushes the return address and RET jumps back to it."""
+    cpu = DT31()
+    call, ret = thread([I.CALL(L[1]), I.RET()])
+    assert call(cpu, 0) == 1
+    assert list(cpu.stack) == [1]
+    assert ret(cpu, 1) == 1
+    assert not cpu.stack
+
+
+@pytest.mark.parametrize(
+    "inst, expected",
+    [
+        (I.CALL(L[7]), 7),
+        (I.CALL(R.a), 4),
+        (I.RCALL(L[-2]), 1),
+        (I.RCALL(M[0]), 6),
+    ],
+)
+def test_thread_call(inst, expected):
+    """CALL/RCALL handlers push the return address and jump to the destination."""
+    cpu = DT31()
+    cpu.registers.update(ip=3, a=4)
+    cpu.memory[0] = 3
+    (handler,) = thread([inst])
+    assert handler(cpu, 3) == expected
+    assert list(cpu.stack) == [4]
+
+
+@pytest.mark.parametrize(
+    "inst, location", [(I.POP(R.b), R.b), (I.POP(M[R.a]), M[2]), (I.POP(), None)]
+)
+def test_thread_pop(inst, location):
+    """POP handlers store the popped value, or discard it without an output."""
+    cpu = DT31()
+    cpu.registers["a"] = 2
+    cpu.stack.extend([8, 9])
+    (handler,) = thread([inst])
+    assert handler(cpu, 0) == 1
+    assert list(cpu.stack) == [8]
+    if location is not None:
+        assert cpu[location] == 9
+
+
+def test_thread_semp():
+    """SEMP handlers store whether the stack is empty."""
+    cpu = DT31()
+    (handler,) = thread([I.SEMP(R.a)])
+    assert handler(cpu, 0) == 1
+    assert cpu.registers["a"] == 1
+    cpu.stack.append(0)
+    handler(cpu, 0)
+    assert cpu.registers["a"] == 0
+
+
+@pytest.mark.parametrize("a, expected", [(L[5], 5), (R.a, 7), (M[R.a], 2)])
+def test_thread_push(a, expected):
+    """PUSH handlers push literal, register and memory operands."""
+    cpu = DT31()
+    cpu.registers["a"] = 7
+    cpu.memory[7] = 2
+    (handler,) = thread([I.PUSH(a)])
+    assert handler(cpu, 0) == 1
+    assert list(cpu.stack) == [expected]
+
+
+@pytest.mark.parametrize(
+    "inst, expected",
+    [
+        (I.NOUT(R.a), "65"),
+        (I.NOUT(R.a, L[1]), "65\n"),
+        (I.COUT(L[66]), "B"),
+        (I.COUT(R.a, L[1]), "A\n"),
+        (I.NOUT(R.a, R.a), "65\n"),
+        (I.NOUT(L[3], R.b), "3"),
+        (I.COUT(M[R.a], R.a), "\x00\n"),
+    ],
+)
+def test_thread_output(inst, expected, capsys):
+    """Output handlers print like the instructions, with or without a newline."""
+    cpu = DT31()
+    cpu.registers["a"] = 65
+    (handler,) = thread([inst])
+    assert handler(cpu, 0) == 1
+    assert capsys.readouterr().out == expected
+
+
+def test_thread_fuses_sequential_handlers():
+    """A sequential handler runs the following instruction too."""
+    cpu = DT31()
+    # NOOP starts the only block entry, so the pairs below aren't compiled into blocks
+    handlers = thread([I.NOOP(), I.CP(1, R.a), I.ADD(R.a, 1), I.JMP(L[0])])
+    assert handlers[1](cpu, 1) == 3
+    assert cpu.registers["a"] == 2
+    assert cpu.registers["ip"] == 2
+    assert cpu.step_count == 1
+    # The second instruction keeps its own handler for jumps into the pair
+    assert handlers[2](cpu, 2) == 0
+    assert cpu.registers["a"] == 3
+
+
+def test_thread_compiles_blocks_at_entries():
+    """Straight-line runs at block entries run as one handler, then continue."""
+    program = [
+        I.CP(5, R.a),
+        I.ADD(R.a, L[2], M[R.b]),
+        I.PUSH(M[0]),
+        I.MUL(R.a, R.a, R.c),
+        I.LT(R.c, L[20], R.d),
+        I.JIF(L[0], R.d),
+    ]
+    cpu = DT31(registers=["a", "b", "c", "d"])
+    handlers = thread(program)
+    assert handlers[0](cpu, 0) == 6
+    assert cpu.memory[0] == 7
+    assert list(cpu.stack) == [7]
+    assert cpu.registers["c"] == 25
+    assert cpu.registers["d"] == 0
+    assert cpu.step_count == 5
+
+    ran, stepped = _run_and_step(program)
+    assert ran == stepped
+    assert ran[-1] == 6
+
+
+def test_thread_block_error_leaves_state_at_failing_instruction():
+    """A block stops at an instruction that raises, with ip and steps up to date."""
+    cpu = DT31()
+    handlers = thread([I.CP(5, R.a), I.DIV(R.a, R.b), I.CP(1, R.c), I.NOUT(R.a)])
+    with pytest.raises(ZeroDivisionError):
+        handlers[0](cpu, 0)
+    assert cpu.registers["ip"] == 1
+    assert cpu.step_count == 1
+    assert cpu.registers["a"] == 5
+    assert cpu.registers["c"] == 0
+
+
+def test_thread_block_skips_ip_operands():
+    """Instructions reading the ip register see their own position."""
+    program = [I.CP(5, R.a), I.CP(R.ip, R.b), I.ADD(R.ip, L[0], M[R.ip]), I.NOOP()]
+    ran, stepped = _run_and_step(program)
+    assert ran == stepped
+    assert ran[2]["b"] == 1
+    assert ran[3][3] == 2
+
+
+def test_thread_constant_fold_keeps_runtime_errors():
+    """Literal operations that fail are not folded and raise when executed."""
+    cpu = DT31()
+    (handler,) = thread([I.DIV(L[1], L[0], R.a)])
+    with pytest.raises(ZeroDivisionError):
+        handler(cpu, 0)
+
+
+def test_thread_call_pushes_return_address():
+    """CALL handlers push the return address before jumping."""
+    cpu = DT31()
+    cpu.registers["ip"] = 3
+    (call,) = thread([I.CALL(L[10])])
+    assert call(cpu, 3) == 10
+    assert list(cpu.stack) == [4]
+
+
+def test_thread_write_to_ip_uses_generic_handler():
+    """Instructions writing the ip register still control flow when threaded."""
+    cpu = DT31()
+    (handler,) = thread([I.ADD(L[40], L[2], R.ip)])
+    assert handler(cpu, 0) == 42
+
+
+def test_thread_custom_call_is_respected():
+    """Subclasses overriding __call__ are threaded through __call__."""
+    calls = []
+
+    class TRACE(I.CP):
+        def __call__(self, cpu):
+            calls.append(self)
+            return super().__call__(cpu)
+
+    cpu = DT31()
+    (handler,) = thread([TRACE(L[1], R.a)])
+    assert handler(cpu, 0) == 1
+    assert len(calls) == 1
+    assert cpu.registers["a"] == 1
+
+
+def test_extract_registers_custom_instruction_attributes():
+    """Operands on attributes of custom instructions are found."""
+
+    class SWAP(I.Instruction):
+        def __init__(self, x, y):
+            super().__init__("SWAP")
+            self.x = x
+            self.y = y
+
+    class CLAMP3(I.BinaryOperation):
+        OPERAND_ATTRS = ("a", "b", "c", "out")
+
+        def __init__(self, a, b, c, out=None):
+            super().__init__("CLAMP3", a, b, out)
+            self.c = c
+
+    assert SWAP.OPERAND_ATTRS is None
+    program = [SWAP(R.p, M[R.q]), CLAMP3(R.a, L[1], M[M[R.z]])]
+    assert extract_registers_from_program(program) == ["a", "p", "q", "z"]
+
+
+def test_extract_registers_reflects_replaced_items():
+    """Re-analysing a program after replacing items reflects the change."""
+    program = [I.CP(L[1], R.x)]
+    assert extract_registers_from_program(program) == ["x"]
+    result = extract_registers_from_program(program)
+    result.append("y")
+    assert extract_registers_from_program(program) == ["x"]
+    program[0] = I.CP(L[1], R.y)
+    assert extract_registers_from_program(program) == ["y"]
@@ -0,0 +1,76 @@
+import pytest
+
+from dt31 import instructions as I
+from dt31.assembler import AssemblyError, assemble
+from dt31.builder import ProgramBuilder
+from dt31.cpu import DT31
+from dt31.operands import L, Label, Literal, R
+
+
+def test_backward_reference_resolved_on_add():
+    builder = ProgramBuilder()
+    loop = builder.label("loop")
+    builder.add(I.NOOP(), I.JMP(loop), I.RJMP(loop))
+    program = builder.build()
+    assert program[1].dest == Literal(0)
+    assert program[2].dest == Literal(-2)
+
+
+def test_forward_reference_patched_on_label():
+    builder = ProgramBuilder()
+    builder.add(I.JMP(Label("end")), I.RJMP(Label("end")), I.NOOP())
+    builder.label("end")
+    builder.add(I.NOOP())
+    program = builder.build()
+    assert program[0].dest == Literal(3)
+    assert program[1].dest == Literal(2)
+
+
+def test_matches_assemble():
+    source = [
+        I.CP(5, R.a),
+        Label("loop"),
+        I.SUB(R.a, L[1]),
+        I.RJGT(Label("loop"), R.a, L[0]),
+        I.JMP(Label("end")),
+        Label("end"),
+    ]
+    builder = ProgramBuilder()
+    for item in source:
+        if isinstance(item, Label):
+            builder.label(item.name)
+        else:
+            builder.add(item)
+    assert builder.build() == assemble(source)
+
+
+def test_originals_unchanged():
+    jump = I.JMP(Label("end"))
+    builder = ProgramBuilder()
+    builder.add(jump)
+    builder.label("end")
+    assert isinstance(jump.dest, Label)
+
+
+def test_duplicate_label():
+    builder = ProgramBuilder()
+    builder.label("x")
+    with pytest.raises(AssemblyError, match="Label x used more than once"):
+        builder.label("x")
+
+
+def test_undefined_label():
+    builder = ProgramBuilder()
+    builder.add(I.JMP(Label("nowhere")))
+    with pytest.raises(AssemblyError, match="Undefined label: nowhere"):
+        builder.build()
+
+
+def test_run_built_program():
+    builder = ProgramBuilder()
+    builder.add(I.CP(0, R.a))
+    loop = builder.label("loop")
+    builder.add(I.ADD(R.a, L[1]), I.JLT(loop, R.a, L[10]))
+    cpu = DT31()
+    cpu.run(builder.build())
+    assert cpu.get_register("a") == 10
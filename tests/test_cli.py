@@ -9,6 +9,15 @@ import pytest
 from dt31.cli import main
 
 
+@pytest.fixture(autouse=True)
+def parse_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep the parse cache out of the user's cache directory."""
+    cache_home = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    monkeypatch.delenv("DT31_PARSE_CACHE", raising=False)
+    return cache_home / "dt31"
+
+
 @pytest.fixture
 def temp_dt_file(tmp_path):
     """Create a temporary .dt file for testing."""
@@ -57,6 +66,17 @@ def test_cli_user_provided_registers_validated(temp_dt_file, capsys):
     assert "y" in captured.err
 
 
+def test_cli_user_provided_registers_whitespace_ignored(temp_dt_file, capsys):
+    file_path = temp_dt_file("CP 10, R.x\nCP 20, R.y\nNOUT R.y, 1")
+
+    with patch.object(sys, "argv", ["dt31", "run", "--registers", " x, y,", file_path]):
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+
+    assert exc_info.value.code == 0
+    assert capsys.readouterr().out == "20\n"
+
+
 def test_check_valid_file(temp_dt_file, capsys):
     """Test check command with valid file."""
     assembly = """
@@ -2079,3 +2099,130 @@ def test_verbose_with_exit_no_code(tmp_path, capsys):
     # Verbose statistics should be shown
     assert "Wall time:" in captured.err
     assert "Steps: 1" in captured.err  # EXIT executes during step 1
+
+
+# ------------------------------- fast argument parsing ------------------------------ #
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["run", "program.dt"],
+        ["run", "-d", "program.dt"],
+        ["run", "--verbose", "--memory", "512", "program.dt"],
+        ["run", "program.dt", "--stack-size=64", "-r", "a,b"],
+        ["run", "-i", "custom.py", "--dump", "all", "--dump-file", "out.json", "p.dt"],
+    ],
+)
+def test_fast_parse_run_matches_argparse(argv):
+    from dt31.cli import _build_parser, _fast_parse_run
+
+    assert _fast_parse_run(argv) == _build_parser().parse_args(argv)
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        [],
+        ["--version"],
+        ["check", "program.dt"],
+        ["run"],
+        ["run", "--help"],
+        ["run", "a.dt", "b.dt"],
+        ["run", "--memory", "lots", "program.dt"],
+        ["run", "--dump", "sometimes", "program.dt"],
+        ["run", "--mem", "512", "program.dt"],
+        ["run", "program.dt", "--memory"],
+    ],
+)
+def test_fast_parse_run_defers_to_argparse(argv):
+    from dt31.cli import _fast_parse_run
+
+    assert _fast_parse_run(argv) is None
+
+
+def test_build_parser_is_reused():
+    from dt31.cli import _build_parser
+
+    assert _build_parser() is _build_parser()
+
+
+# ----------------------------------- parse cache ------------------------------------ #
+
+
+def _run_file(file_path):
+    with patch.object(sys, "argv", ["dt31", "run", file_path]):
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+    assert exc_info.value.code == 0
+
+
+def test_run_reuses_cached_parse(
+    temp_dt_file, parse_cache_dir, monkeypatch, capsys
+):
+    monkeypatch.setenv("DT31_PARSE_CACHE", "1")
+    file_path = temp_dt_file("CP 7, R.q\nNOUT R.q, 1")
+
+    _run_file(file_path)
+    assert len(list(parse_cache_dir.glob("*.pkl"))) == 1
+
+    with patch("dt31.cli.parse_program", side_effect=AssertionError("parsed")):
+        _run_file(file_path)
+
+    assert capsys.readouterr().out == "7\n7\n"
+
+
+def test_parse_cache_disabled_by_default(temp_dt_file, parse_cache_dir):
+    _run_file(temp_dt_file("CP 7, R.q"))
+
+    assert not parse_cache_dir.exists()
+
+
+def test_parse_cache_evicts_least_recently_used(
+    temp_dt_file, parse_cache_dir, monkeypatch
+):
+    monkeypatch.setenv("DT31_PARSE_CACHE", "1")
+    monkeypatch.setattr("dt31.cli._PARSE_CACHE_MAX_ENTRIES", 2)
+    first = temp_dt_file("NOUT 1, 0", "first.dt")
+    _run_file(first)
+    _run_file(temp_dt_file("NOUT 2, 0", "second.dt"))
+    for cache_file in parse_cache_dir.glob("*.pkl"):
+        os.utime(cache_file, ns=(0, 0))
+    _run_file(first)
+
+    _run_file(temp_dt_file("NOUT 3, 0", "third.dt"))
+
+    assert len(list(parse_cache_dir.glob("*.pkl"))) == 2
+    with patch("dt31.cli.parse_program", side_effect=AssertionError("parsed")):
+        _run_file(first)
+
+
+def test_corrupt_parse_cache_is_ignored(
+    temp_dt_file, parse_cache_dir, monkeypatch, capsys
+):
+    monkeypatch.setenv("DT31_PARSE_CACHE", "1")
+    file_path = temp_dt_file("NOUT 3, 1")
+    _run_file(file_path)
+    for cache_file in parse_cache_dir.glob("*.pkl"):
+        cache_file.write_bytes(b"not a pickle")
+
+    _run_file(file_path)
+
+    assert capsys.readouterr().out == "3\n3\n"
+
+
+def test_load_custom_instructions_reuses_unchanged_file(tmp_path):
+    from dt31.cli import load_custom_instructions
+
+    custom_file = tmp_path / "custom.py"
+    custom_file.write_text(
+        "from dt31.instructions import NOOP\nINSTRUCTIONS = {'FOO': NOOP}\n"
+    )
+
+    first = load_custom_instructions(str(custom_file))
+    assert load_custom_instructions(str(custom_file)) is first
+
+    custom_file.write_text(
+        "from dt31.instructions import NOOP\nINSTRUCTIONS = {'BAR': NOOP}\n"
+    )
+    assert list(load_custom_instructions(str(custom_file))) == ["BAR"]
@@ -183,6 +183,25 @@ def test_run_debug(cpu, capsys, monkeypatch):
     ]
 
 
+def test_run_after_replacing_instructions(cpu):
+    """Resuming runs the current instructions even if they were replaced."""
+    cpu.run([I.CP(1, R.a)])
+    cpu.instructions = [I.CP(2, R.b)]
+    cpu.set_register("ip", 0)
+    cpu.run()
+    assert cpu.get_register("a") == 1
+    assert cpu.get_register("b") == 2
+
+
+def test_run_replaced_instructions_validates_registers(cpu):
+    """Replacing instructions directly still validates register names before running."""
+    cpu.run([I.NOOP()])
+    cpu.instructions = [I.ADD(R.missing, 1)]
+    cpu.set_register("ip", 0)
+    with pytest.raises(AssemblyError, match="Missing registers"):
+        cpu.run()
+
+
 def test_run_without_load_raises_error(cpu):
     with pytest.raises(RuntimeError, match="No program loaded"):
         cpu.run()
@@ -207,6 +226,33 @@ def test_run_without_arguments_resumes_from_ip(cpu):
     assert cpu.get_register("ip") == 4
 
 
+def test_run_without_arguments_sees_changed_instructions(cpu):
+    """Appending, replacing or mutating loaded instructions affects a resumed run."""
+    cpu.load([I.CP(1, R.a)])
+    cpu.run()
+    cpu.instructions.append(I.ADD(R.a, L[10]))
+    cpu.run()
+    assert cpu.get_register("a") == 11
+    cpu.instructions[1] = I.ADD(R.a, L[100])
+    cpu.set_register("ip", 1)
+    cpu.run()
+    assert cpu.get_register("a") == 111
+    cpu.instructions[1].b = L[1000]
+    cpu.set_register("ip", 1)
+    cpu.run()
+    assert cpu.get_register("a") == 1111
+
+
+def test_run_reflects_instructions_edited_in_place(capsys):
+    """Re-running a program after editing an instruction runs the edited version."""
+    program = [I.NOUT(L[1], L[1])]
+    cpu = DT31()
+    cpu.run(program)
+    program[0].a = L[7]
+    cpu.run(program)
+    assert capsys.readouterr().out == "1\n7\n"
+
+
 def test_load(cpu):
     insts = [I.ADD(M[1], M[2]), I.NOOP(), I.JGT(0, 100, M[1])]
     cpu.load(insts)
@@ -263,6 +309,20 @@ def test_state(cpu):
     }
 
 
+def test_state_memory_repeated_values():
+    cpu = DT31(memory_size=8)
+    for index, value in [(0, 5), (2, 5), (3, -1), (6, 5), (7, 2)]:
+        cpu.set_memory(index, value)
+
+    assert list(cpu.state.items())[:5] == [
+        ("M[0]", 5),
+        ("M[2]", 5),
+        ("M[3]", -1),
+        ("M[6]", 5),
+        ("M[7]", 2),
+    ]
+
+
 def test_cpu_validates_missing_registers():
     """Test that CPU raises error when program uses missing registers."""
     cpu = DT31(registers=["a", "b"])
@@ -418,3 +478,52 @@ def test_step_count_matches_instructions():
     cpu.run(program)
 
     assert cpu.step_count == 3
+
+
+def _run_and_step(source: str) -> list[tuple]:
+    """Execute a program with `run` and with repeated `step`, returning both end states."""
+    states = []
+    for stepping in (False, True):
+        cpu = DT31(memory_size=16)
+        program = parse_program(source)
+        error = None
+        try:
+            if stepping:
+                cpu.load(program)
+                while 0 <= cpu.registers["ip"] < len(cpu.instructions):
+                    cpu.step()
+            else:
+                cpu.run(program)
+        except Exception as e:
+            error = type(e)
+        states.append(
+            (error, cpu.registers, cpu.memory, list(cpu.stack), cpu.step_count)
+        )
+    return states
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        # Operations without a generated expression, storing through R.ip
+        "NOOP\nCP 3, R.b\nAND R.b, 1, [R.ip]\nOR 0, R.b, [[R.ip]]",
+        # Failing stores leave ip past the instruction, as __call__ advances first
+        "NOOP\nCP 40, R.c\nAND 1, 1, [R.c]",
+        "NOOP\nCP 40, R.c\nOR R.c, 1, [R.c]",
+        # Operations with generated handlers
+        "NOOP\nCP 5, R.b\nSUB 4, [R.b], [R.ip]",
+        "NOOP\nCP 2, R.a\nADD R.a, 1, [[R.ip]]",
+        "NOOP\nCP 40, R.c\nADD R.b, 1, [R.c]",
+        "NOOP\nCP 40, R.c\nNOT R.b, [R.c]",
+        # Compiled blocks
+        "CP 40, R.c\nCP 1, R.a\nADD R.a, 2, [R.c]\nCP 9, R.b",
+        "CP 40, R.c\nCP 1, R.a\nNOT R.a, [R.c]\nCP 9, R.b",
+        "CP 40, R.c\nCP 1, R.a\nCP R.a, [R.c]\nCP 9, R.b",
+        "CP 1, R.a\nSUB 4, R.a, [R.ip]\nADD R.a, 1, R.a",
+        "CP 5, R.a\nDIV R.a, R.b, R.c\nCP 1, R.c",
+    ],
+)
+def test_run_matches_step(source):
+    """Threaded execution leaves the same state as stepping through the program."""
+    ran, stepped = _run_and_step(source)
+    assert ran == stepped
@@ -21,6 +21,7 @@ from factorial_with_labels import (  # type: ignore # noqa: E402
 )
 from fibonacci import fibonacci  # type: ignore # noqa: E402
 from hello_world import hello_world  # type: ignore # noqa: E402
+from program_builder import countdown  # type: ignore # noqa: E402
 from simple_calculator import calculator  # type: ignore # noqa: E402
 from sum_array import sum_array  # type: ignore # noqa: E402
 
@@ -33,6 +34,7 @@ TESTED_PYTHON_PROGRAMS = [
     "factorial_with_labels.py",
     "fibonacci.py",
     "hello_world.py",
+    "program_builder.py",
     "simple_calculator.py",
     "sum_array.py",
 ]
@@ -208,6 +210,21 @@ def test_simple_calculator(capsys):
     assert captured.out == expected_output
 
 
+def test_program_builder(capsys):
+    """Test the countdown built with ProgramBuilder, including skipping the loop."""
+    cpu = DT31(registers=["a"])
+
+    with patch("builtins.input", side_effect=["3", "0"]):
+        cpu.run(countdown, debug=False)
+        cpu.run(countdown, debug=False)
+
+    captured = capsys.readouterr()
+
+    # Expected: 3, 2, 1 for the first run and nothing for the second
+    expected_output = "3\n2\n1\n"
+    assert captured.out == expected_output
+
+
 def test_sum_array(capsys):
     """Test sum array: reads numbers until 0, then sums them."""
     cpu = DT31(registers=["a", "b", "c"])
@@ -216,6 +216,13 @@ def test_neq(cpu):
     assert I.NE(30, 31, M[10])(cpu) == 1
 
 
+@pytest.mark.parametrize("op", [I.LT, I.GT, I.LE, I.GE, I.EQ, I.NE, I.XOR])
+def test_comparisons_store_ints(cpu, op):
+    for a, b in [(1, 2), (2, 1), (2, 2)]:
+        assert type(op(a, b, M[10])(cpu)) is int
+        assert type(cpu.get_memory(10)) is int
+
+
 def test_and(cpu):
     assert I.AND(0, 1, M[10])(cpu) == 0
     assert I.AND(1, 0, M[10])(cpu) == 0
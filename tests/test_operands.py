@@ -10,7 +10,12 @@ from dt31.operands import (
     Operand,
     R,
     RegisterReference,
+    KIND_LABEL,
+    KIND_LITERAL,
+    KIND_MEMORY,
+    KIND_REGISTER,
     as_op,
+    intern_literal,
 )
 
 
@@ -206,6 +211,42 @@ def test_register_reference_equality():
     assert r1 != "a"
 
 
+def test_unslotted_operand_subclass_equality():
+    """Subclasses without __slots__ compare the attributes in their instance dict."""
+
+    class Const(Operand):
+        def __init__(self, value):
+            self.value = value
+
+    assert Const(1) == Const(1)
+    assert Const(1) != Const(2)
+
+
+def test_slotted_reference_subclass_equality():
+    """Slotted subclasses compare inherited slots as well as their own."""
+
+    class OffsetMemory(MemoryReference):
+        __slots__ = ("offset",)
+
+        def __init__(self, address, offset):
+            super().__init__(address)
+            self.offset = offset
+
+    class TaggedRegister(RegisterReference):
+        __slots__ = "tag"
+
+        def __init__(self, register, tag):
+            super().__init__(register)
+            self.tag = tag
+
+    assert OffsetMemory(5, 1) == OffsetMemory(5, 1)
+    assert OffsetMemory(5, 1) != OffsetMemory(6, 1)
+    assert OffsetMemory(5, 1) != OffsetMemory(5, 2)
+    assert TaggedRegister("a", 1) == TaggedRegister("a", 1)
+    assert TaggedRegister("a", 1) != TaggedRegister("b", 1)
+    assert TaggedRegister("a", 1) != TaggedRegister("a", 2)
+
+
 def test_label_equality():
     l1 = Label("start")
     l2 = Label("start")
@@ -310,3 +351,46 @@ def test_lc_escape_sequences_str():
     # Regular character (should not be escaped)
     lc_regular = LC["A"]
     assert str(lc_regular) == "'A'"
+
+
+def test_intern_literal():
+    assert intern_literal(5) is intern_literal(5)
+    assert L[-256] is as_op(-256)
+    assert intern_literal(1000) == Literal(1000)
+    assert intern_literal(1000) is not intern_literal(1000)
+    assert not intern_literal(65).is_char
+
+
+def test_literal_hash():
+    assert hash(L[3]) == hash(Literal(3)) == hash(3)
+    assert len({L[3], Literal(3), L[4]}) == 2
+
+
+def test_operands_use_slots():
+    for operand in [L[1], R.a, M[R.a], Label("x")]:
+        assert not hasattr(operand, "__dict__")
+    assert M[R.a] == M[R.a]
+    assert M[R.a] != M[R.b]
+    assert R.a != M[R.a]
+
+
+def test_operand_kinds():
+    assert L[1].KIND == LC["a"].KIND == KIND_LITERAL
+    assert R.a.KIND == KIND_REGISTER
+    assert M[R.a].KIND == KIND_MEMORY
+    assert Label("x").KIND == KIND_LABEL
+    assert Operand.KIND is None
+
+
+@pytest.mark.parametrize("operand", [L[7], R.a, M[1], M[R.a], M[M[2]]])
+def test_specialize_matches_resolve(cpu, operand):
+    cpu.set_memory(2, 1)
+    assert operand.specialize()(cpu) == operand.resolve(cpu)
+
+
+def test_specialize_respects_overridden_resolve(cpu):
+    class Doubled(RegisterReference):
+        def resolve(self, cpu):
+            return 2 * super().resolve(cpu)
+
+    assert Doubled("a").specialize()(cpu) == 2 * cpu.get_register("a")
@@ -1121,3 +1121,18 @@ def test_blank_line_inequality_with_other_types():
     assert blank != Label("test")
     assert blank != Comment("test")
     assert blank != I.CP(5, R.a)
+
+
+def test_parse_program_collects_registers():
+    text = """
+    CP 5, R.a
+    loop:
+        NOUT [R.b], 1
+        ADD M[[R.c]], R.ip
+        JGT loop, R.a, 0
+    """
+    registers: set[str] = set()
+    program = parse_program(text, registers=registers)
+
+    assert registers == {"a", "b", "c"}
+    assert sorted(registers) == extract_registers_from_program(program)